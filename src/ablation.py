@@ -0,0 +1,126 @@
+# ablation.py
+# Ablation benchmark for the search core (see search.py).
+# Each feature is measured both ways on the bundled reference positions: removed from the fully
+# featured search ("all on - feature") and added to the bare negamax ("all off + feature"). Nodes,
+# time and the number of changed best moves are reported against the configuration it was derived from.
+#
+# Usage:
+#   python3 src/ablation.py --depth 2 --repeat 3 --output ablation.json
+
+import argparse
+import json
+import statistics
+import sys
+from time import perf_counter
+
+from evaluation import evaluate_board
+from search import ORDER_ALL, ORDER_NONE, SearchConfig, search
+from selective import QUIESCENCE_DEPTH_BUDGET
+from benchmark import parse_position
+from benchmark_positions import BENCHMARK_POSITIONS
+
+# Feature name -> SearchConfig settings that switch it on
+FEATURES = {
+    'alpha_beta': {'alpha_beta': True},
+    'quiescence': {'quiescence_depth': QUIESCENCE_DEPTH_BUDGET},
+    'move_ordering': {'move_ordering': ORDER_ALL},
+    'transposition_table': {'transposition_table': True},
+    'bitbases': {'bitbases': True},
+}
+ALL_OFF = SearchConfig(alpha_beta=False, quiescence_depth=0, move_ordering=ORDER_NONE, transposition_table=False, bitbases=False)
+ALL_ON = ALL_OFF.replace(**{name: value for settings in FEATURES.values() for name, value in settings.items()})
+DEFAULT_DEPTH = 2
+DEFAULT_REPEAT = 1
+
+def ablation_variants(features):
+    """
+    Lists the configurations to measure.
+
+    Returns:
+        list: (variant name, SearchConfig, name of the reference variant or None) tuples.
+    """
+    variants = [("all on", ALL_ON, None)]
+    for feature in features:
+        off_settings = {name: getattr(ALL_OFF, name) for name in FEATURES[feature]}
+        variants.append((f"all on - {feature}", ALL_ON.replace(**off_settings), "all on"))
+    variants.append(("all off", ALL_OFF, None))
+    for feature in features:
+        variants.append((f"all off + {feature}", ALL_OFF.replace(**FEATURES[feature]), "all off"))
+    return variants
+
+def measure(config, positions, depth, repeat):
+    """
+    Searches every position with one configuration.
+
+    Returns:
+        list: One {"fen", "best_move", "score", "nodes", "mean_time"} dictionary per position.
+    """
+    measurements = []
+    for fen_string in positions:
+        board_state, player_to_move = parse_position(fen_string)
+        times = []
+        for _ in range(repeat):
+            start_time = perf_counter()
+            result = search(board_state, player_to_move, depth, evaluate_board, config)
+            times.append(perf_counter() - start_time)
+        measurements.append({"fen": fen_string, "best_move": result["best_move"], "score": result["score"],
+                             "nodes": result["nodes"], "mean_time": statistics.mean(times)})
+    return measurements
+
+def run_ablation(features, depth, categories, repeat):
+    """
+    Measures every ablation variant and compares it with its reference.
+
+    Returns:
+        list: One summary dictionary per variant, in the order of ablation_variants.
+    """
+    positions = [fen for category in categories for fen in BENCHMARK_POSITIONS[category]]
+    summaries = {}
+    for name, config, reference in ablation_variants(features):
+        print(f"Measuring {name}...")
+        per_position = measure(config, positions, depth, repeat)
+        nodes = sum(p["nodes"] for p in per_position)
+        total_time = sum(p["mean_time"] for p in per_position)
+        summary = {
+            "variant": name, "config": vars(config), "reference": reference, "depth": depth,
+            "positions": len(per_position), "repeat": repeat, "nodes": nodes, "time": total_time,
+            "nps": nodes / total_time if total_time > 0 else 0.0, "per_position": per_position
+        }
+        if reference is not None:
+            base = summaries[reference]
+            summary["nodes_ratio"] = nodes / base["nodes"]
+            summary["time_ratio"] = total_time / base["time"] if base["time"] > 0 else None
+            summary["changed_moves"] = sum(p["best_move"] != b["best_move"] for p, b in zip(per_position, base["per_position"]))
+        summaries[name] = summary
+    return list(summaries.values())
+
+def print_report(summaries):
+    print(f"\n{'variant':<34} {'nodes':>10} {'time (s)':>9} {'nps':>8} {'nodes x':>8} {'time x':>7} {'changed':>8}")
+    for s in summaries:
+        if s["reference"] is None:
+            ratios = f"{'-':>8} {'-':>7} {'-':>8}"
+        else:
+            time_ratio = f"{s['time_ratio']:>7.2f}" if s["time_ratio"] is not None else f"{'-':>7}"
+            ratios = f"{s['nodes_ratio']:>8.2f} {time_ratio} {s['changed_moves']:>8}"
+        print(f"{s['variant']:<34} {s['nodes']:>10} {s['time']:>9.3f} {s['nps']:>8.0f} {ratios}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Ablation benchmark of the search core features.")
+    parser.add_argument('--features', nargs='+', choices=list(FEATURES), default=list(FEATURES))
+    parser.add_argument('--categories', nargs='+', choices=list(BENCHMARK_POSITIONS), default=list(BENCHMARK_POSITIONS))
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per position.")
+    parser.add_argument('--output', help="Path of the JSON results file.")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        sys.exit("--repeat must be at least 1")
+
+    summaries = run_ablation(args.features, args.depth, args.categories, args.repeat)
+    print_report(summaries)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"results": summaries}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
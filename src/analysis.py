@@ -0,0 +1,139 @@
+# analysis.py
+# Vectorized analysis of columnar results (see results_store.py).
+# Every statistic is computed with NumPy over whole columns, so it scales to runs of 100k+ boards
+# and to many runs combined.
+#
+# Usage:
+#   python3 src/analysis.py run1.npz run2.npz ...
+
+import argparse
+
+import numpy as np
+
+from results_store import load_columns, STABILITY_REASONS
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+def compare_engines(columns, engine_a, engine_b):
+    """
+    Compares the Stockfish scores of two engines' moves on every board, from the mover's perspective.
+    A missing score counts as 0, matching how the plots have always treated unjudged moves.
+
+    Returns:
+        np.ndarray: int8 per board: 1 if engine_a's move is better, -1 if engine_b's is, 0 if equal.
+    """
+    score_a = np.nan_to_num(columns[f"{engine_a}_true_score"], nan=0.0)
+    score_b = np.nan_to_num(columns[f"{engine_b}_true_score"], nan=0.0)
+    # White wants a higher score, Black a lower one
+    return np.sign((score_a - score_b) * columns["player_to_move"]).astype(np.int8)
+
+def group_rows(columns, group_by):
+    """
+    Groups the rows by the distinct value combinations of the given columns.
+
+    Returns:
+        tuple: (keys, inverse) where keys is a list of value tuples and inverse maps each row to its group index.
+    """
+    if not group_by:
+        return [()], np.zeros(len(columns["board_id"]), dtype=np.intp)
+    stacked = np.stack([columns[name].astype(np.int64) for name in group_by], axis=1)
+    unique_keys, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    return [tuple(int(v) for v in key) for key in unique_keys], inverse.reshape(-1)
+
+def outcome_rates(columns, engine_a, engine_b, group_by=("is_unstable", "depth")):
+    """
+    Win/loss/equal counts and rates of engine_a against engine_b, per group.
+    Only boards on which both engines ran are counted (e.g. runs without the naive phase are skipped).
+
+    Returns:
+        dict: group key -> {"boards", "a_better", "b_better", "equal", "a_better_rate", "b_better_rate", "equal_rate"}.
+    """
+    ran_both = ~np.isnan(columns[f"{engine_a}_runtime"]) & ~np.isnan(columns[f"{engine_b}_runtime"])
+    columns = {name: values[ran_both] for name, values in columns.items()}
+    outcome = compare_engines(columns, engine_a, engine_b)
+    keys, inverse = group_rows(columns, group_by)
+    n_groups = len(keys)
+    boards = np.bincount(inverse, minlength=n_groups)
+    # One bincount per outcome, weighted by a 0/1 mask
+    a_better = np.bincount(inverse, weights=outcome == 1, minlength=n_groups).astype(np.int64)
+    b_better = np.bincount(inverse, weights=outcome == -1, minlength=n_groups).astype(np.int64)
+    equal = boards - a_better - b_better
+    rates = {}
+    for g, key in enumerate(keys):
+        total = max(boards[g], 1)
+        rates[key] = {
+            "boards": int(boards[g]), "a_better": int(a_better[g]), "b_better": int(b_better[g]), "equal": int(equal[g]),
+            "a_better_rate": a_better[g] / total, "b_better_rate": b_better[g] / total, "equal_rate": equal[g] / total
+        }
+    return rates
+
+def runtime_distribution(columns, engine, group_by=("is_unstable", "depth"), percentiles=DEFAULT_PERCENTILES):
+    """
+    Runtime statistics of one engine per group. Boards the engine did not run on (NaN runtime) are ignored.
+
+    Returns:
+        dict: group key -> {"boards", "total", "mean", "std", "p<N>" for each percentile}.
+    """
+    runtimes = columns[f"{engine}_runtime"]
+    valid = ~np.isnan(runtimes)
+    keys, inverse = group_rows(columns, group_by)
+    # Sort once by group, then each group is a contiguous slice of the sorted runtimes
+    order = np.lexsort((runtimes, inverse))
+    order = order[valid[order]]
+    sorted_groups = inverse[order]
+    sorted_runtimes = runtimes[order]
+    bounds = np.searchsorted(sorted_groups, np.arange(len(keys) + 1))
+    summary = {}
+    for g, key in enumerate(keys):
+        values = sorted_runtimes[bounds[g]:bounds[g + 1]]
+        if len(values) == 0: continue
+        stats = {"boards": len(values), "total": float(values.sum()), "mean": float(values.mean()), "std": float(values.std())}
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            stats[f"p{p}"] = float(value)
+        summary[key] = stats
+    return summary
+
+def format_group(group_by, key):
+    parts = []
+    for name, value in zip(group_by, key):
+        if name == "stability_reason":
+            value = STABILITY_REASONS[value] if 0 <= value < len(STABILITY_REASONS) else "unknown"
+        elif name == "is_unstable":
+            value = "unstable" if value else "stable"
+        parts.append(f"{name}={value}")
+    return ", ".join(parts) or "all"
+
+def print_outcome_rates(columns, engine_a, engine_b, group_by):
+    print(f"\n{engine_a} vs {engine_b} (judged by Stockfish)")
+    for key, r in outcome_rates(columns, engine_a, engine_b, group_by).items():
+        print(f"  {format_group(group_by, key):<48} boards={r['boards']:<7} {engine_a} better {r['a_better_rate']:6.1%}  "
+              f"{engine_b} better {r['b_better_rate']:6.1%}  equal {r['equal_rate']:6.1%}")
+
+def print_runtime_distribution(columns, engine, group_by, percentiles):
+    print(f"\n{engine} runtime (seconds)")
+    for key, s in runtime_distribution(columns, engine, group_by, percentiles).items():
+        pcts = "  ".join(f"p{p}={s[f'p{p}']:.3f}" for p in percentiles)
+        print(f"  {format_group(group_by, key):<48} boards={s['boards']:<7} mean={s['mean']:.3f}  std={s['std']:.3f}  {pcts}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse one or more saved .npz simulation runs.")
+    parser.add_argument('paths', nargs='+', help="Saved runs (.npz) to combine.")
+    parser.add_argument('--group-by', nargs='*', default=["is_unstable", "depth"],
+                        help="Columns to group by, e.g. stability_reason depth run.")
+    parser.add_argument('--percentiles', nargs='+', type=float, default=list(DEFAULT_PERCENTILES))
+    args = parser.parse_args()
+
+    columns = load_columns(args.paths)
+    print(f"Loaded {len(columns['board_id'])} boards from {len(args.paths)} run(s).")
+    group_by = tuple(args.group_by)
+    percentiles = [int(p) if float(p).is_integer() else p for p in args.percentiles]
+
+    print_outcome_rates(columns, "selective", "fixed", group_by)
+    if not np.all(np.isnan(columns["naive_true_score"])):
+        print_outcome_rates(columns, "fixed", "naive", group_by)
+    for engine in ("fixed", "selective", "naive"):
+        if not np.all(np.isnan(columns[f"{engine}_runtime"])):
+            print_runtime_distribution(columns, engine, group_by, percentiles)
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,9 @@ def board_to_fen(board_state, player_to_move):
     fen += f' {active_color} - - 0 1'
     return fen
 
+# Time Stockfish spends judging one position
+JUDGE_LIMIT = chess.engine.Limit(time=0.1)
+
 # Evaluate the board position using Stockfish
 def get_stockfish_evaluation(board_state, player_to_move, engine):
     if not engine:
@@ -38,9 +41,18 @@ def get_stockfish_evaluation(board_state, player_to_move, engine):
     board = chess.Board(fen_string)
 
     # Let Stockfish analyze the board for a short time (0.1 sec)
-    info = engine.analyse(board, chess.engine.Limit(time=0.1))
+    info = engine.analyse(board, JUDGE_LIMIT)
     
     # Get centipawn score from white's perspective
-    score = info["score"].white().score(mate_score=10000)
+    return white_centipawns(info)
+
+# Same as get_stockfish_evaluation, for an engine opened with the asyncio API (chess.engine.popen_uci)
+async def get_stockfish_evaluation_async(board_state, player_to_move, engine):
+    if not engine:
+        return 0
+    board = chess.Board(board_to_fen(board_state, player_to_move))
+    info = await engine.analyse(board, JUDGE_LIMIT)
+    return white_centipawns(info)
 
-    return score
+def white_centipawns(info):
+    return info["score"].white().score(mate_score=10000)
@@ -0,0 +1,237 @@
+# benchmark.py
+# Headless benchmark for the search engines.
+# Runs each engine on the bundled reference positions at fixed depths and reports time, nodes and
+# nodes per second, without the dataset, Stockfish, judging or plotting.
+#
+# Usage:
+#   python3 src/benchmark.py --depth 2 --repeat 3 --output bench.json
+#   python3 src/benchmark.py --save-baseline            # store the current results as the baseline
+#   python3 src/benchmark.py --save-baseline --nodes-only   # store node counts only (the committed baseline)
+#   python3 src/benchmark.py                            # exits with status 1 on a regression or without a baseline
+#
+# Probing the endgame bitbases changes the node counts of the endgame positions, so the baseline keeps
+# one entry per set of generated bitbases, and each run is compared with the entry of its own set.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+from time import perf_counter, strftime
+
+from board import fen_to_2d_board
+from bitbase import default_bitbases
+from evaluation import evaluate_board, evaluate_boards_batch
+from minimax import find_best_move_fixed_depth
+from selective import find_best_move_selective
+from minimax_naive import find_best_move_naive
+from minimax_batched import find_best_move_batched
+from benchmark_positions import BENCHMARK_POSITIONS
+
+# Engine name -> (search function, evaluation function passed to it)
+ENGINES = {
+    'fixed': (find_best_move_fixed_depth, evaluate_board),
+    'selective': (find_best_move_selective, evaluate_board),
+    'naive': (find_best_move_naive, evaluate_board),
+    'batched': (find_best_move_batched, evaluate_boards_batch),
+}
+DEFAULT_ENGINES = ['fixed', 'selective', 'batched'] # Naive is opt-in, it is much slower
+DEFAULT_DEPTH = 2
+DEFAULT_REPEAT = 3
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DEFAULT_TIME_TOLERANCE = 0.25 # Allowed slowdown against the baseline (fraction of its mean time)
+DEFAULT_NODE_TOLERANCE = 0.0 # Node counts are deterministic, so any increase is a regression
+
+def parse_position(fen_string):
+    """
+    Converts a FEN string into the (board_state, player_to_move) pair used by the engines.
+    """
+    player_to_move = 1 if fen_string.split(' ')[1] == 'w' else -1
+    return fen_to_2d_board(fen_string), player_to_move
+
+def bitbase_set():
+    """
+    Name of the bitbases the engines probe in this process (e.g. "KPK+KQK+KRK"), or "none".
+    """
+    return '+'.join(sorted(default_bitbases())) or 'none'
+
+def benchmark_engine(engine_name, depth, categories, repeat):
+    """
+    Benchmarks one engine on every position of the given categories.
+
+    Returns:
+        list: One result dictionary per category.
+    """
+    search_fn, evaluate_fn = ENGINES[engine_name]
+    results = []
+    for category in categories:
+        positions = []
+        # Each repeat is the total time over the whole category, so variance is measured per run of the set.
+        category_times = [0.0] * repeat
+        for fen_string in BENCHMARK_POSITIONS[category]:
+            board_state, player_to_move = parse_position(fen_string)
+            times = []
+            for i in range(repeat):
+                start_time = perf_counter()
+                result = search_fn(board_state, player_to_move, depth, evaluate_fn)
+                times.append(perf_counter() - start_time)
+                category_times[i] += times[-1]
+            # Every engine runs on the search core, so nodes are the positions it searched (see search.search)
+            positions.append({
+                "fen": fen_string, "best_move": result["best_move"], "score": result["score"],
+                "nodes": result["nodes"], "mean_time": statistics.mean(times)
+            })
+
+        total_nodes = sum(p["nodes"] for p in positions)
+        mean_time = statistics.mean(category_times)
+        results.append({
+            "engine": engine_name, "category": category, "depth": depth, "bitbases": bitbase_set(),
+            "positions": len(positions), "repeat": repeat,
+            "mean_time": mean_time,
+            "stdev_time": statistics.stdev(category_times) if repeat > 1 else 0.0,
+            "min_time": min(category_times),
+            "max_time": max(category_times),
+            "nodes": total_nodes,
+            "nps": total_nodes / mean_time if mean_time > 0 else 0.0,
+            "per_position": positions
+        })
+    return results
+
+def result_key(result):
+    return f"{result['engine']}/{result['category']}/d{result['depth']}/bitbases={result['bitbases']}"
+
+def nodes_only(report):
+    """
+    Strips the machine-dependent timings from a report. Node counts are deterministic, so a nodes-only
+    baseline can be committed and checked on any machine.
+    """
+    results = []
+    for r in report["results"]:
+        results.append({
+            "engine": r["engine"], "category": r["category"], "depth": r["depth"], "bitbases": r["bitbases"],
+            "positions": r["positions"], "nodes": r["nodes"],
+            "per_position": [{"fen": p["fen"], "best_move": p["best_move"], "nodes": p["nodes"]} for p in r["per_position"]]
+        })
+    return {"results": results}
+
+def merge_baseline(baseline, report):
+    """
+    Replaces the baseline entries measured again in report and keeps the others (e.g. those of another
+    set of bitbases), so one baseline file covers every configuration it was saved with.
+    """
+    measured = {result_key(r) for r in report["results"]}
+    kept = [r for r in baseline["results"] if result_key(r) not in measured]
+    return dict(report, results=sorted(kept + report["results"], key=result_key))
+
+def find_regressions(results, baseline, time_tolerance, node_tolerance):
+    """
+    Compares the results against a stored baseline. Timings are only compared when the baseline has them.
+
+    Returns:
+        tuple: (human-readable descriptions of each regression found, keys of the results the baseline has no entry for).
+    """
+    baseline_by_key = {result_key(r): r for r in baseline["results"]}
+    regressions = []
+    missing = []
+    for r in results:
+        base = baseline_by_key.get(result_key(r))
+        if base is None:
+            missing.append(result_key(r))
+            continue
+        if "mean_time" in base and r["mean_time"] > base["mean_time"] * (1 + time_tolerance):
+            regressions.append(f"{result_key(r)}: time {r['mean_time']:.3f}s vs baseline {base['mean_time']:.3f}s "
+                               f"(+{r['mean_time'] / base['mean_time'] - 1:.0%}, tolerance {time_tolerance:.0%})")
+        if r["nodes"] > base["nodes"] * (1 + node_tolerance):
+            regressions.append(f"{result_key(r)}: nodes {r['nodes']} vs baseline {base['nodes']}")
+    return regressions, missing
+
+def print_report(results):
+    print(f"\n{'engine':<10} {'category':<11} {'depth':>5} {'mean (s)':>10} {'stdev (s)':>10} {'nodes':>10} {'nps':>10}")
+    for r in results:
+        print(f"{r['engine']:<10} {r['category']:<11} {r['depth']:>5} {r['mean_time']:>10.3f} "
+              f"{r['stdev_time']:>10.3f} {r['nodes']:>10} {r['nps']:>10.0f}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Headless benchmark for the AlgoChess search engines.")
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=DEFAULT_ENGINES)
+    parser.add_argument('--categories', nargs='+', choices=list(BENCHMARK_POSITIONS), default=list(BENCHMARK_POSITIONS))
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help="Search depth used for every engine.")
+    parser.add_argument('--engine-depth', action='append', default=[], metavar='ENGINE=DEPTH',
+                        help="Overrides the depth of one engine, e.g. --engine-depth fixed=3.")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per position.")
+    parser.add_argument('--output', help="Path of the JSON results file.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="Path of the stored baseline JSON.")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline.")
+    parser.add_argument('--nodes-only', action='store_true',
+                        help="With --save-baseline, store only the node counts, which do not depend on the machine.")
+    parser.add_argument('--no-check', action='store_true', help="Only measure, without comparing against the baseline.")
+    parser.add_argument('--time-tolerance', type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument('--node-tolerance', type=float, default=DEFAULT_NODE_TOLERANCE)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.repeat < 1:
+        sys.exit("--repeat must be at least 1")
+    depths = {name: args.depth for name in args.engines}
+    for override in args.engine_depth:
+        name, _, depth = override.partition('=')
+        if name not in depths or not depth.isdigit():
+            sys.exit(f"Invalid --engine-depth '{override}', expected one of {args.engines} as ENGINE=DEPTH")
+        depths[name] = int(depth)
+
+    results = []
+    for name in args.engines:
+        print(f"Benchmarking {name} at depth {depths[name]} ({args.repeat} repeat(s))...")
+        results.extend(benchmark_engine(name, depths[name], args.categories, args.repeat))
+    print_report(results)
+
+    report = {
+        "meta": {
+            "timestamp": strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.save_baseline:
+        saved = nodes_only(report) if args.nodes_only else report
+        if baseline is not None:
+            saved = merge_baseline(baseline, saved)
+        with open(args.baseline, 'w') as f:
+            json.dump(saved, f, indent=2)
+        print(f"Baseline saved to {args.baseline} (bitbases: {bitbase_set()})")
+        return 0
+    if args.no_check:
+        return 0
+
+    if baseline is None:
+        print(f"\nERROR: No baseline found at {args.baseline}; run with --save-baseline to create one, "
+              f"or pass --no-check to only measure.")
+        return 1
+    regressions, missing = find_regressions(results, baseline, args.time_tolerance, args.node_tolerance)
+    if missing:
+        print(f"\n{'ERROR' if len(missing) == len(results) else 'WARNING'}: The baseline has no entry for "
+              f"{', '.join(missing)}; save one with --save-baseline.")
+        if len(missing) == len(results):
+            return 1
+    if regressions:
+        print("\nREGRESSIONS against the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# benchmark_positions.py
+# Reference positions for the headless benchmark (benchmark.py).
+# The sets are fixed so that node counts stay comparable between runs; do not edit a set
+# without regenerating the stored baseline.
+
+BENCHMARK_POSITIONS = {
+    # Quiet positions: no check, no capture available and nothing hanging (evaluation.is_unstable is False)
+    "stable": [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1",
+        "rnbqkb1r/pppppppp/5n2/8/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 1 2",
+        "8/5pk1/6p1/8/8/6P1/5PK1/8 w - - 0 1",
+    ],
+    # Tactical positions: side to move is in check, has a capture, or has a piece en prise
+    "unstable": [
+        "rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 2",
+        "rnbqk1nr/pppp1ppp/8/4p3/1b1PP3/8/PPP2PPP/RNBQKBNR w KQkq - 1 3",
+        "r1bqk2r/pppp1ppp/2n2n2/2b1p1N1/2B1P3/8/PPPP1PPP/RNBQK2R b KQkq - 5 4",
+        "6k1/5ppp/8/8/3r4/8/5PPP/3R2K1 w - - 0 1",
+    ],
+    "opening": [
+        "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2",
+        "rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5",
+        "rnbqk2r/ppp1bppp/4pn2/3p4/2PP4/2N2N2/PP2PPPP/R1BQKB1R w KQkq - 4 5",
+        "r1bqkbnr/pppp1ppp/2n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3",
+    ],
+    "middlegame": [
+        "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 1 8",
+        "2r2rk1/pp3ppp/2n1pn2/q7/3P4/P1N1PN2/1P3PPP/R2Q1RK1 w - - 0 14",
+        "2rq1rk1/pb1nbppp/1p2pn2/2pp4/3P4/1P1BPN2/PBPN1PPP/2RQ1RK1 w - - 0 11",
+        "r2qr1k1/1p1bbppp/p1np1n2/4p3/4P3/1NN1BP2/PPPQ2PP/2KR1B1R w - - 4 11",
+    ],
+    "endgame": [
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "8/8/4k3/8/2R5/8/4K3/8 w - - 0 1",
+        "8/5k2/8/3P4/8/8/8/4K3 w - - 0 1",
+        "6k1/5p2/6p1/8/7P/6P1/r4PK1/1R6 b - - 0 1",
+    ],
+}
@@ -0,0 +1,239 @@
+# bitbase.py
+# Win/draw bitbases for endgames of two kings and one piece (KQK, KRK, KPK).
+# The tables are generated offline by retrograde analysis with the move rules of board.py, stored as
+# one bit per position and memory-mapped when the engines probe them, so every worker process shares
+# the same pages.
+#
+# Usage:
+#   python3 src/bitbase.py                          # generate every table into src/bitbases/
+#   python3 src/bitbase.py --tables KQK KRK --processes 4
+#
+# Positions are normalized so the side with the extra piece is white. The index of a position is
+# ((side * 64 + white_king) * 64 + black_king) * 64 + piece, where side is 0 when the strong side is to
+# move and squares are numbered row * 8 + col. A set bit means the strong side wins; the lone king can
+# never win, so the other positions are draws.
+# The engines do not model promotion, so a pawn reaching the last rank is treated as a queen (as the
+# UCI front-end plays it), which makes KPK depend on KQK. Pawns move one square at a time as in board.py.
+# On the engines' boards the pawn stays a pawn on the last rank, so probe() looks such positions up in KQK.
+
+import argparse
+import os
+from multiprocessing import Pool, cpu_count
+from time import time
+
+import numpy as np
+
+from board import (EMPTY, WHITE_KING, BLACK_KING, WHITE_QUEEN, WHITE_ROOK, WHITE_PAWN,
+                   create_empty_board, generate_pseudo_legal_moves, is_king_in_check, is_legal_move)
+
+DEFAULT_BITBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bitbases')
+# Table name -> the strong side's piece, in generation order (KPK promotes into KQK)
+TABLES = {'KQK': WHITE_QUEEN, 'KRK': WHITE_ROOK, 'KPK': WHITE_PAWN}
+TABLE_SIZE = 2 * 64 * 64 * 64
+PROBE_PIECES = 3 # Pieces on the board (kings included) of every position the tables cover
+DRAW_CHILD = TABLE_SIZE # Child reference of a move into a drawn position outside the table (the piece is captured)
+WIN_CHILD = TABLE_SIZE + 1 # Child reference of a move into a won position outside the table (a winning promotion)
+
+# Probe results, from the perspective of the side to move
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+def position_index(side, white_king, black_king, piece):
+    return ((side * 64 + white_king) * 64 + black_king) * 64 + piece
+
+def _is_valid(side, white_king, black_king, piece, piece_type):
+    if len({white_king, black_king, piece}) < 3: return False
+    if abs(white_king // 8 - black_king // 8) <= 1 and abs(white_king % 8 - black_king % 8) <= 1: return False
+    if piece_type == WHITE_PAWN and piece // 8 in (0, 7): return False
+    return True
+
+def _board_for(white_king, black_king, piece, piece_type):
+    board = create_empty_board()
+    board[white_king // 8][white_king % 8] = WHITE_KING
+    board[black_king // 8][black_king % 8] = BLACK_KING
+    board[piece // 8][piece % 8] = piece_type
+    return board
+
+def _legal_moves(board, player, king):
+    # Against a lone king nothing is pinned, so only king moves need the legality test
+    return [move for move in generate_pseudo_legal_moves(board, player)
+            if move[0] != king or is_legal_move(board, move, player)]
+
+def generate_moves_for_king(task):
+    """
+    Enumerates the positions of one table with the white king on one square (runs in a worker process).
+
+    Args:
+        task (tuple): (piece type, white king square).
+
+    Returns:
+        tuple: (parents, children, mated) arrays. Each move from a position is an edge
+        parents[i] -> children[i]; promotions have children[i] = -1 - (the index of the position in KQK).
+        mated lists the indices of checkmated positions.
+    """
+    piece_type, white_king = task
+    parents, children, mated = [], [], []
+    for side in (0, 1):
+        player = 1 if side == 0 else -1
+        for black_king in range(64):
+            for piece in range(64):
+                if not _is_valid(side, white_king, black_king, piece, piece_type): continue
+                board = _board_for(white_king, black_king, piece, piece_type)
+                # The side that just moved cannot be in check
+                if is_king_in_check(board, 'black' if side == 0 else 'white'): continue
+                index = position_index(side, white_king, black_king, piece)
+                king = white_king if side == 0 else black_king
+                moves = _legal_moves(board, player, (king // 8, king % 8))
+                if not moves:
+                    if is_king_in_check(board, 'white' if side == 0 else 'black'): mated.append(index)
+                    continue
+                for (from_r, from_c), (to_r, to_c) in moves:
+                    from_sq, to_sq = from_r * 8 + from_c, to_r * 8 + to_c
+                    parents.append(index)
+                    if side == 1 and to_sq == piece:
+                        children.append(DRAW_CHILD)
+                    elif from_sq == white_king:
+                        children.append(position_index(1 - side, to_sq, black_king, piece))
+                    elif from_sq == black_king:
+                        children.append(position_index(1 - side, white_king, to_sq, piece))
+                    elif piece_type == WHITE_PAWN and to_r == 0:
+                        children.append(-1 - position_index(1, white_king, black_king, to_sq))
+                    else:
+                        children.append(position_index(1 - side, white_king, black_king, to_sq))
+    return np.array(parents, dtype=np.int32), np.array(children, dtype=np.int32), np.array(mated, dtype=np.int32)
+
+def solve(parents, children, mated):
+    """
+    Retrograde analysis by fixed-point iteration: a position with the strong side to move is won if
+    any move reaches a won position, one with the lone king to move if every move does (or it is mated).
+
+    Returns:
+        np.ndarray: bool per table index, True where the strong side wins.
+    """
+    won = np.zeros(TABLE_SIZE + 2, dtype=bool)
+    won[WIN_CHILD] = True
+    won[mated] = True
+    strong_to_move = np.arange(TABLE_SIZE) < TABLE_SIZE // 2
+    move_counts = np.bincount(parents, minlength=TABLE_SIZE)
+    while True:
+        won_children = np.bincount(parents, weights=won[children], minlength=TABLE_SIZE)
+        new_won = np.where(strong_to_move, won_children > 0, (move_counts > 0) & (won_children == move_counts))
+        new_won |= won[:TABLE_SIZE]
+        if np.array_equal(new_won, won[:TABLE_SIZE]): return new_won
+        won[:TABLE_SIZE] = new_won
+
+def generate_table(name, processes, solved):
+    """
+    Generates one table. `solved` holds the tables generated so far (KPK needs KQK).
+    """
+    with Pool(processes=processes) as pool:
+        parts = pool.map(generate_moves_for_king, [(TABLES[name], white_king) for white_king in range(64)])
+    parents = np.concatenate([p[0] for p in parts])
+    children = np.concatenate([p[1] for p in parts])
+    mated = np.concatenate([p[2] for p in parts])
+    promotions = children < 0
+    if promotions.any():
+        children[promotions] = np.where(solved['KQK'][-1 - children[promotions]], WIN_CHILD, DRAW_CHILD)
+    return solve(parents, children, mated)
+
+def save_table(won, path):
+    np.save(path, np.packbits(won))
+
+def load_bitbases(directory=DEFAULT_BITBASE_DIR):
+    """
+    Memory-maps every generated table found in the directory.
+
+    Returns:
+        dict: Table name -> packed bit array. Tables that were not generated are missing.
+    """
+    tables = {}
+    for name in TABLES:
+        path = os.path.join(directory, f"{name}.npy")
+        if os.path.exists(path):
+            tables[name] = np.load(path, mmap_mode='r')
+    return tables
+
+_loaded_bitbases = None
+
+def default_bitbases():
+    # Loaded once per process, on first use
+    global _loaded_bitbases
+    if _loaded_bitbases is None:
+        _loaded_bitbases = load_bitbases()
+    return _loaded_bitbases
+
+def _normalize(board, player_to_move):
+    """
+    Returns:
+        tuple: (table name, side, white king, black king, piece) with the strong side as white, or None
+        when no table covers the material.
+    """
+    squares = ''.join([''.join(row) for row in board])
+    if len(squares) - squares.count(EMPTY) != PROBE_PIECES: return None
+    for piece_type in 'QRPqrp':
+        piece = squares.find(piece_type)
+        if piece >= 0: break
+    else:
+        return None
+    white_king, black_king = squares.find(WHITE_KING), squares.find(BLACK_KING)
+    if piece_type.isupper():
+        side = 0 if player_to_move == 1 else 1
+    else:
+        # Mirror the board vertically and swap the colours, so the strong side is white
+        white_king, black_king, piece = black_king ^ 56, white_king ^ 56, piece ^ 56
+        side = 0 if player_to_move == -1 else 1
+    name = 'K' + piece_type.upper() + 'K'
+    if name == 'KPK' and piece // 8 == 0:
+        name = 'KQK' # A promoted pawn, which KPK scores as a queen
+    return name, side, white_king, black_king, piece
+
+def table_name(board):
+    """
+    Name of the table covering the material on the board (e.g. 'KQK'), or None.
+    """
+    position = _normalize(board, 1)
+    return position[0] if position else None
+
+def probe(bitbases, board, player_to_move):
+    """
+    Looks the position up in the bitbases.
+
+    Returns:
+        int: WIN, DRAW or LOSS for the side to move, or None when the material is not covered.
+    """
+    position = _normalize(board, player_to_move)
+    if position is None: return None
+    name, side, white_king, black_king, piece = position
+    table = bitbases.get(name)
+    if table is None: return None
+    index = position_index(side, white_king, black_king, piece)
+    if not (table[index >> 3] >> (7 - (index & 7))) & 1: return DRAW
+    return WIN if side == 0 else LOSS
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the endgame bitbases by retrograde analysis.")
+    parser.add_argument('--tables', nargs='+', choices=list(TABLES), default=list(TABLES))
+    parser.add_argument('--output-dir', default=DEFAULT_BITBASE_DIR)
+    parser.add_argument('--processes', type=int, default=cpu_count())
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    solved = {name: np.unpackbits(table).astype(bool) for name, table in load_bitbases(args.output_dir).items()}
+    for name in TABLES:
+        if name not in args.tables: continue
+        if name == 'KPK' and 'KQK' not in solved:
+            print("KPK needs KQK for promotions; generating KQK first.")
+            solved['KQK'] = generate_table('KQK', args.processes, solved)
+            save_table(solved['KQK'], os.path.join(args.output_dir, "KQK.npy"))
+        start_time = time()
+        solved[name] = generate_table(name, args.processes, solved)
+        path = os.path.join(args.output_dir, f"{name}.npy")
+        save_table(solved[name], path)
+        half = TABLE_SIZE // 2
+        print(f"{name}: {int(solved[name][:half].sum())} wins with the strong side to move, "
+              f"{int(solved[name][half:].sum())} losses with the lone king to move; "
+              f"saved to {path} in {time() - start_time:.1f} seconds.")
+
+if __name__ == "__main__":
+    main()
@@ -102,41 +102,118 @@ def is_king_in_check(board_state, king_color_str):
     if king_pos is None:
         return False
 
-    opponent_player_value = 1 if king_color_str == 'black' else -1
-    opponent_attacking_moves = generate_pseudo_legal_moves(board_state, opponent_player_value)
+    return is_square_attacked(board_state, king_pos, get_opponent_color_str(king_color_str))
+
+# --- Attack maps ---
+KNIGHT_DELTAS = [(-2,-1), (-2,1), (-1,-2), (-1,2), (1,-2), (1,2), (2,-1), (2,1)]
+KING_DELTAS = [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]
+ROOK_DIRECTIONS = [(-1,0), (1,0), (0,-1), (0,1)]
+BISHOP_DIRECTIONS = [(-1,-1), (-1,1), (1,-1), (1,1)]
+
+# Check whether any piece of by_color_str attacks pos.
+# Looks outward from the target square (pawn diagonals, knight jumps, king steps and the
+# first piece on each ray) instead of generating every move of the attacking side.
+def is_square_attacked(board_state, pos, by_color_str):
+    r, c = pos
+    if by_color_str == 'white':
+        pawn, knight, bishop, rook, queen, king = WHITE_PAWN, WHITE_KNIGHT, WHITE_BISHOP, WHITE_ROOK, WHITE_QUEEN, WHITE_KING
+        pawn_r = r + 1 # White pawns capture towards row 0
+    else:
+        pawn, knight, bishop, rook, queen, king = BLACK_PAWN, BLACK_KNIGHT, BLACK_BISHOP, BLACK_ROOK, BLACK_QUEEN, BLACK_KING
+        pawn_r = r - 1
+
+    if 0 <= pawn_r < 8:
+        if c > 0 and board_state[pawn_r][c-1] == pawn: return True
+        if c < 7 and board_state[pawn_r][c+1] == pawn: return True
+
+    for dr, dc in KNIGHT_DELTAS:
+        to_r, to_c = r + dr, c + dc
+        if 0 <= to_r < 8 and 0 <= to_c < 8 and board_state[to_r][to_c] == knight:
+            return True
 
-    for from_sq, to_sq in opponent_attacking_moves:
-        if to_sq == king_pos:
+    for dr, dc in KING_DELTAS:
+        to_r, to_c = r + dr, c + dc
+        if 0 <= to_r < 8 and 0 <= to_c < 8 and board_state[to_r][to_c] == king:
             return True
+
+    for directions, slider in ((ROOK_DIRECTIONS, rook), (BISHOP_DIRECTIONS, bishop)):
+        for dr, dc in directions:
+            curr_r, curr_c = r + dr, c + dc
+            while 0 <= curr_r < 8 and 0 <= curr_c < 8:
+                piece = board_state[curr_r][curr_c]
+                if piece != EMPTY:
+                    if piece == slider or piece == queen:
+                        return True
+                    break
+                curr_r += dr
+                curr_c += dc
     return False
 
+# Squares attacked by the piece on pos (pawns attack diagonally only; sliders stop at the first piece)
+def attacked_squares(board_state, pos):
+    r, c = pos
+    piece = board_state[r][c]
+    if piece in (WHITE_PAWN, BLACK_PAWN):
+        to_r = r - 1 if piece == WHITE_PAWN else r + 1
+        return [(to_r, to_c) for to_c in (c - 1, c + 1) if is_valid_position((to_r, to_c))]
+    if piece in (WHITE_KNIGHT, BLACK_KNIGHT) or piece in (WHITE_KING, BLACK_KING):
+        deltas = KNIGHT_DELTAS if piece in (WHITE_KNIGHT, BLACK_KNIGHT) else KING_DELTAS
+        return [(r + dr, c + dc) for dr, dc in deltas if is_valid_position((r + dr, c + dc))]
+
+    if piece in (WHITE_ROOK, BLACK_ROOK): directions = ROOK_DIRECTIONS
+    elif piece in (WHITE_BISHOP, BLACK_BISHOP): directions = BISHOP_DIRECTIONS
+    elif piece in (WHITE_QUEEN, BLACK_QUEEN): directions = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+    else: return []
+    squares = []
+    for dr, dc in directions:
+        curr_r, curr_c = r + dr, c + dc
+        while 0 <= curr_r < 8 and 0 <= curr_c < 8:
+            squares.append((curr_r, curr_c))
+            if board_state[curr_r][curr_c] != EMPTY:
+                break
+            curr_r += dr
+            curr_c += dc
+    return squares
+
+# Lazily yield the pseudo-legal captures of a player, so callers can stop at the first one they need
+def iter_pseudo_legal_captures(board_state, player_to_move):
+    own_pieces = WHITE_PIECES if player_to_move == 1 else BLACK_PIECES
+    enemy_pieces = BLACK_PIECES if player_to_move == 1 else WHITE_PIECES
+    for r in range(8):
+        for c in range(8):
+            if board_state[r][c] in own_pieces:
+                for to_r, to_c in attacked_squares(board_state, (r, c)):
+                    if board_state[to_r][to_c] in enemy_pieces:
+                        yield ((r, c), (to_r, to_c))
+
 # --- Terminal state detection (checkmate/stalemate) ---
 def is_terminal(board_state, player_to_move):
-    legal_moves = generate_legal_moves(board_state, player_to_move)
-
-    if not legal_moves:
-        king_color_str = player_value_to_color_str(player_to_move)
-        if is_king_in_check(board_state, king_color_str):
-            return True  # Checkmate
-        else:
-            return True  # Stalemate
-    return False
+    # Both checkmate and stalemate end the game
+    return not has_legal_move(board_state, player_to_move)
 
 # --- Legal and pseudo-legal move ---
 def generate_legal_moves(board_state, player_to_move):
     legal_moves = []
     pseudo_legal_moves = generate_pseudo_legal_moves(board_state, player_to_move)
-    
-    current_player_color_str = player_value_to_color_str(player_to_move)
 
     for move in pseudo_legal_moves:
-        temp_board, _ = apply_move(board_state, move, player_to_move)
-        
-        if not is_king_in_check(temp_board, current_player_color_str):
+        if is_legal_move(board_state, move, player_to_move):
             legal_moves.append(move)
             
     return legal_moves
 
+# A pseudo-legal move is legal if it does not leave the mover's own king in check
+def is_legal_move(board_state, move, player_to_move):
+    temp_board, _ = apply_move(board_state, move, player_to_move)
+    return not is_king_in_check(temp_board, player_value_to_color_str(player_to_move))
+
+# Early-exit terminal test: stops at the first legal move instead of generating all of them
+def has_legal_move(board_state, player_to_move):
+    for move in generate_pseudo_legal_moves(board_state, player_to_move):
+        if is_legal_move(board_state, move, player_to_move):
+            return True
+    return False
+
 def generate_pseudo_legal_moves(board_state, player_to_move):
     pseudo_moves = []
     current_player_color_str = player_value_to_color_str(player_to_move)
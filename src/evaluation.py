@@ -1,6 +1,7 @@
 # evaluation.py
 
-from board import get_piece_color, WHITE_PIECES, BLACK_PIECES, EMPTY, is_capture_move, generate_legal_moves, is_king_in_check
+import numpy as np
+from board import EMPTY, find_king, is_legal_move, is_square_attacked, iter_pseudo_legal_captures
 
 # Assign static material values to pieces (positive for white, negative for black)
 PIECE_VALUES = {
@@ -18,27 +19,99 @@ def evaluate_board(board_state):
                 score += PIECE_VALUES.get(piece, 0) 
     return score
 
-# Check if the board state is unstable (in check or under threat)
-def is_unstable(board_state, player_to_move):
+# --- Batched NumPy evaluation ---
+# Positions are encoded as int8 arrays of 64 squares (row-major, a8 first):
+# 0 = empty, 1..6 = white P N B R Q K, -1..-6 = black p n b r q k
+PIECE_CODES = {
+    EMPTY: 0,
+    'P': 1, 'N': 2, 'B': 3, 'R': 4, 'Q': 5, 'K': 6,
+    'p': -1, 'n': -2, 'b': -3, 'r': -4, 'q': -5, 'k': -6
+}
+CODE_PIECES = {code: piece for piece, code in PIECE_CODES.items()}
+
+# Lookup from the ASCII byte of a square to its int8 code
+_ASCII_TO_CODE = np.zeros(256, dtype=np.int8)
+for _piece, _code in PIECE_CODES.items():
+    _ASCII_TO_CODE[ord(_piece)] = _code
+
+_SQUARES = np.arange(64)
+
+def build_eval_table(piece_square_tables=None):
+    """
+    Builds the (13, 64) table used by evaluate_encoded: row code + 6 holds the score of that
+    piece on each square, from white's perspective.
+
+    Args:
+        piece_square_tables (dict): Optional bonus per white piece letter, each a sequence of
+            64 values (a8 first) seen from white's side. Black pieces use the mirrored, negated table.
+            Without it the table is pure material and matches evaluate_board.
+
+    Returns:
+        np.ndarray: The int32 evaluation table.
+    """
+    table = np.zeros((13, 64), dtype=np.int32)
+    for piece, code in PIECE_CODES.items():
+        if piece != EMPTY:
+            table[code + 6, :] = PIECE_VALUES[piece]
+    for piece, bonus in (piece_square_tables or {}).items():
+        bonus = np.asarray(bonus, dtype=np.int32).reshape(8, 8)
+        table[PIECE_CODES[piece] + 6, :] += bonus.ravel()
+        table[PIECE_CODES[piece.lower()] + 6, :] -= bonus[::-1].ravel()
+    return table
+
+MATERIAL_TABLE = build_eval_table()
+
+# Encode one board as an int8 array of 64 square codes
+def encode_board(board_state):
+    return encode_boards([board_state])[0]
+
+# Encode a list of boards as an (n, 64) int8 array in one lookup
+def encode_boards(board_states):
+    raw = ''.join(''.join(row) for board in board_states for row in board).encode('ascii')
+    return _ASCII_TO_CODE[np.frombuffer(raw, dtype=np.uint8)].reshape(len(board_states), 64)
+
+# Decode an int8 array back into the 2D board representation
+def decode_board(encoded):
+    return [[CODE_PIECES[int(code)] for code in encoded[r * 8:(r + 1) * 8]] for r in range(8)]
+
+# Score a batch of encoded positions (white's perspective) with a single table gather
+def evaluate_encoded(encoded_boards, table=MATERIAL_TABLE):
+    encoded_boards = np.atleast_2d(encoded_boards)
+    return table[encoded_boards.astype(np.intp) + 6, _SQUARES].sum(axis=1)
+
+# Batched counterpart of evaluate_board: one score per board, in the same order
+def evaluate_boards_batch(board_states, table=MATERIAL_TABLE):
+    if not board_states:
+        return np.zeros(0, dtype=np.int32)
+    return evaluate_encoded(encode_boards(board_states), table)
+
+# --- Stability classification ---
+# Reason codes returned by classify_stability
+STABLE = 'stable'
+IN_CHECK = 'in_check' # The player to move is in check
+CAPTURE_AVAILABLE = 'capture_available' # The player to move has a legal capture
+PIECE_HANGING = 'piece_hanging' # The opponent has a legal capture of one of our pieces
+
+# Classify the position using attack maps, returning at the first reason found.
+# Only candidate captures get a trial apply_move for the legality test, instead of every move of both sides.
+def classify_stability(board_state, player_to_move):
     current_player_color_str = 'white' if player_to_move == 1 else 'black'
+    opponent_color_str = 'black' if player_to_move == 1 else 'white'
+
+    king_pos = find_king(board_state, current_player_color_str)
+    if king_pos is not None and is_square_attacked(board_state, king_pos, opponent_color_str):
+        return IN_CHECK
 
-    # In check = unstable
-    if is_king_in_check(board_state, current_player_color_str):
-        return True
-    
-    # If current player has a capture move = unstable
-    moves = generate_legal_moves(board_state, player_to_move)
-    for move in moves:
-        if is_capture_move(board_state, move):
-            return True
-
-    opponent_player_to_move = -player_to_move
-    opponent_moves = generate_legal_moves(board_state, opponent_player_to_move)
-    for move in opponent_moves:
-        if is_capture_move(board_state, move):
-            _, to_pos = move
-            captured_piece = board_state[to_pos[0]][to_pos[1]]
-            if get_piece_color(captured_piece) == current_player_color_str:
-                return True
-
-    return False
+    for move in iter_pseudo_legal_captures(board_state, player_to_move):
+        if is_legal_move(board_state, move, player_to_move):
+            return CAPTURE_AVAILABLE
+
+    for move in iter_pseudo_legal_captures(board_state, -player_to_move):
+        if is_legal_move(board_state, move, -player_to_move):
+            return PIECE_HANGING
+
+    return STABLE
+
+# Check if the board state is unstable (in check or under threat)
+def is_unstable(board_state, player_to_move):
+    return classify_stability(board_state, player_to_move) != STABLE
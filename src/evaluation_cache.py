@@ -0,0 +1,86 @@
+# evaluation_cache.py
+# Bounded LRU cache in front of any evaluate_fn.
+# Quiescence reaches the same leaf through different capture orders and from different root moves,
+# so the same positions are evaluated many times per search.
+
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 200000 # Roughly 250 bytes per entry, so about 50 MB at the default bound
+
+# Key for a position: the 64 squares as one string.
+# It is exact, so a collision can never return the score of another position, and Python hashes it
+# once per lookup. The side to move is not part of the key because evaluate_fn only receives the board.
+def position_key(board_state):
+    return ''.join([''.join(row) for row in board_state])
+
+class EvaluationCache:
+    """
+    Wraps an evaluation function with a bounded least-recently-used cache.
+    The wrapper is called exactly like the function it wraps, so it can be passed as evaluate_fn to
+    find_best_move_fixed_depth, find_best_move_selective and find_best_move_naive.
+
+    Each instance caches a single evaluate_fn; wrap each evaluator in its own instance so scores
+    from different evaluators never mix. The evaluator must be a pure function of the board.
+
+    Args:
+        evaluate_fn (function): The evaluation function to cache.
+        max_entries (int): Maximum number of cached positions; the least recently used is evicted first.
+    """
+    def __init__(self, evaluate_fn, max_entries=DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.evaluate_fn = evaluate_fn
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, board_state):
+        key = position_key(board_state)
+        entries = self._entries
+        score = entries.get(key)
+        if score is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return score
+
+        self.misses += 1
+        score = self.evaluate_fn(board_state)
+        entries[key] = score
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return score
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Only the configuration is sent to Pool workers; each worker fills its own cache.
+        return {"evaluate_fn": self.evaluate_fn, "max_entries": self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(state["evaluate_fn"], state["max_entries"])
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss/eviction counters, current size and hit rate.
+        """
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "size": len(self._entries), "max_entries": self.max_entries, "hit_rate": self.hit_rate
+        }
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def clear(self):
+        self._entries.clear()
+        self.reset_stats()
@@ -2,6 +2,7 @@
 # Main orchestrator for runing and comparing the engines
 # It handles user interaction, simulation phases, judging, and data visualization.
 
+import argparse
 import csv
 import os
 from time import time
@@ -15,15 +16,62 @@ import chess.engine
 
 # --- Our project modules ---
 from board import fen_to_2d_board, apply_move
-from evaluation import evaluate_board, is_unstable
+from evaluation import evaluate_board, classify_stability, STABLE
 from minimax import find_best_move_fixed_depth
 from selective import find_best_move_selective
 from minimax_naive import find_best_move_naive
 from arbiter import get_stockfish_evaluation, STOCKFISH_PATH
+from pipeline import run_pipeline, run_task, default_processes, DEFAULT_JUDGES
+from profiling import ProfileSession, PROFILE_MODES, DEFAULT_PROFILE_DIR, DEFAULT_TOP_N, DEFAULT_SAMPLE_INTERVAL
+from results_store import results_to_columns, save_columns, DEFAULT_RESULTS_NPZ_PATH
+from analysis import outcome_rates
+from results_log import (ResultsLog, export_results_csv, RECORD_SEARCH, RECORD_JUDGE, RECORD_NAIVE,
+                         SEARCH_FIELDS, JUDGE_FIELDS, NAIVE_FIELDS, DEFAULT_RESULTS_LOG_PATH, DEFAULT_RESULTS_CSV_PATH)
 
 # --- CONSTANTS ---
 # Path to the chess positions dataset.
 DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive', 'chessData.csv')
+# Names of the per-phase profile reports written in --profile mode.
+PROFILE_PHASE_SEARCH = 'phase1_search'
+PROFILE_PHASE_JUDGE = 'phase2_judge'
+PROFILE_PHASE_NAIVE = 'phase3_naive'
+
+def parse_args():
+    """
+    Parses the optional command line flags. The simulation itself is still configured interactively.
+
+    Returns:
+        argparse.Namespace: The parsed flags.
+    """
+    parser = argparse.ArgumentParser(description="Interactive chess engine comparison tool.")
+    parser.add_argument('--results', default=DEFAULT_RESULTS_LOG_PATH,
+                        help="JSONL log that every finished board result is appended to.")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the run recorded in --results, skipping boards and phases already recorded.")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="Start a new run even if --results already holds one (it is replaced on the first write).")
+    parser.add_argument('--csv', default=DEFAULT_RESULTS_CSV_PATH,
+                        help="CSV file exported from the results log at the end of the run.")
+    parser.add_argument('--npz', default=DEFAULT_RESULTS_NPZ_PATH,
+                        help="Columnar .npz file exported from the results log, for analysis.py.")
+    parser.add_argument('--sequential', action='store_true',
+                        help="Run the phases one after another instead of judging results while the search runs.")
+    parser.add_argument('--judges', type=int, default=DEFAULT_JUDGES,
+                        help="Number of Stockfish instances judging concurrently in the pipeline.")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="Search processes used by the pipeline (default: one per core not used by a judge).")
+    parser.add_argument('--queue-size', type=int, default=None,
+                        help="Capacity of the pipeline's judge queue (default: twice the number of search processes).")
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                        help="Profile every phase, including the work done inside Pool workers. "
+                             "'cprofile' is exact, 'sample' is a low-overhead sampler for long runs.")
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR,
+                        help="Directory for the per-worker and merged per-phase .prof files.")
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP_N,
+                        help="Number of hot functions listed in each phase summary.")
+    parser.add_argument('--profile-interval', type=float, default=DEFAULT_SAMPLE_INTERVAL,
+                        help="Sampling interval in seconds for --profile sample.")
+    return parser.parse_args()
 
 def get_user_config():
     """
@@ -117,12 +165,14 @@ def load_boards_from_csv(file_path, num_boards_target):
                 player_char = fen_string.split(' ')[1]
                 player_to_move = 1 if player_char == 'w' else -1 # 1 for White, -1 for Black
 
-                # Store the board data along with an initial stability check.
+                # Store the board data along with an initial stability check (done once at the start).
+                stability_reason = classify_stability(board_2d, player_to_move)
                 boards_data.append({
                     "board_id": board_id_counter,
                     "board_state": board_2d,
                     "player_to_move": player_to_move,
-                    "is_unstable": is_unstable(board_2d, player_to_move) # Check stability once at the start.
+                    "is_unstable": stability_reason != STABLE,
+                    "stability_reason": stability_reason
                 })
                 board_id_counter += 1
     except FileNotFoundError:
@@ -159,8 +209,8 @@ def get_engine_moves(board_data, fixed_depth_param, selective_depth_param, evalu
 
     # Update the dictionary with the moves and runtimes.
     board_data.update({
-        "fixed_best_move": fixed_result["best_move"], "fixed_runtime": fixed_runtime,
-        "selective_best_move": selective_result["best_move"], "selective_runtime": selective_runtime
+        "fixed_best_move": fixed_result["best_move"], "fixed_score": fixed_result["score"], "fixed_runtime": fixed_runtime,
+        "selective_best_move": selective_result["best_move"], "selective_score": selective_result["score"], "selective_runtime": selective_runtime
     })
     return board_data
 
@@ -187,11 +237,11 @@ def get_naive_move(board_data, fixed_depth_param, evaluate_fn_param):
 
     # Update the dictionary with the move and runtime.
     board_data.update({
-        "naive_best_move": naive_result["best_move"], "naive_runtime": naive_runtime
+        "naive_best_move": naive_result["best_move"], "naive_score": naive_result["score"], "naive_runtime": naive_runtime
     })
     return board_data
 
-def run_simulations_parallel(worker_fn, boards_data, phase_name, *args):
+def run_simulations_parallel(worker_fn, boards_data, phase_name, *args, on_result=None):
     """
     A generic helper function to run any worker function in parallel.
 
@@ -200,21 +250,34 @@ def run_simulations_parallel(worker_fn, boards_data, phase_name, *args):
         boards_data (list): The list of boards to process.
         phase_name (str): A descriptive name for the phase for printing.
         *args: Additional arguments to be passed to the worker function.
+        on_result (function): Optional callback receiving each board result as soon as it completes.
+
+    Returns:
+        list: The board results, ordered by board_id.
     """
     print(f"\n{phase_name}: Running on {len(boards_data)} boards using {cpu_count()} CPU cores...")
     start_time = time()
     # Prepare arguments for each task in the pool.
-    simulation_args = [(d, *args) for d in boards_data]
+    simulation_tasks = [(worker_fn, (d, *args)) for d in boards_data]
+    results = []
     # Use multiprocessing.Pool to distribute the work across CPU cores.
+    # Results are collected as they finish so each one can be saved right away.
     with Pool(processes=cpu_count()) as pool:
-        results = pool.starmap(worker_fn, simulation_args)
+        for result in pool.imap_unordered(run_task, simulation_tasks):
+            results.append(result)
+            if on_result: on_result(result)
     print(f"{phase_name} complete in {time() - start_time:.2f} seconds.")
-    return results
+    return sorted(results, key=lambda r: r["board_id"])
 
-def judge_all_moves_with_stockfish(results):
+def judge_all_moves_with_stockfish(results, on_result=None):
     """
     Uses the Stockfish engine to objectively evaluate the moves chosen by our custom engines.
     This runs sequentially, using one persistent Stockfish instance for memory safety and stability.
+    Moves that already have a score (judged earlier or restored from the results log) are not judged again.
+
+    Args:
+        results (list): The board results to judge.
+        on_result (function): Optional callback receiving each board whose scores were updated.
     """
     print(f"\nJudging {len(results)} results with a persistent Stockfish engine...")
     start_time = time()
@@ -225,20 +288,26 @@ def judge_all_moves_with_stockfish(results):
         
         # Iterate through each result and get a "true score" from Stockfish.
         for i, r in enumerate(results):
+            judged = False
             # Judge the move from the fixed-depth A/B engine.
-            if r.get("fixed_best_move"):
+            if r.get("fixed_best_move") and "fixed_true_score" not in r:
                 board, next_player = apply_move(r["board_state"], r["fixed_best_move"], r["player_to_move"])
                 r["fixed_true_score"] = get_stockfish_evaluation(board, next_player, engine)
+                judged = True
             
             # Judge the move from the selective search engine.
-            if r.get("selective_best_move"):
+            if r.get("selective_best_move") and "selective_true_score" not in r:
                 board, next_player = apply_move(r["board_state"], r["selective_best_move"], r["player_to_move"])
                 r["selective_true_score"] = get_stockfish_evaluation(board, next_player, engine)
+                judged = True
             
             # If the naive move exists, judge it as well.
-            if r.get("naive_best_move"):
+            if r.get("naive_best_move") and "naive_true_score" not in r:
                 board, next_player = apply_move(r["board_state"], r["naive_best_move"], r["player_to_move"])
                 r["naive_true_score"] = get_stockfish_evaluation(board, next_player, engine)
+                judged = True
+
+            if judged and on_result: on_result(r)
             
             # Provide a progress update to the user.
             if (i + 1) % 10 == 0: print(f"  Judged {i + 1}/{len(results)} positions...")
@@ -252,34 +321,31 @@ def judge_all_moves_with_stockfish(results):
     print(f"Judging complete in {time() - start_time:.2f} seconds.")
     return results
 
-def visualize_selective_comparison(results):
+def judge_results(results, profiler=None, on_result=None):
+    """
+    Runs the Stockfish judge, under the profiler when profiling is enabled.
+    """
+    if profiler:
+        return profiler.run(PROFILE_PHASE_JUDGE, judge_all_moves_with_stockfish, results, on_result)
+    return judge_all_moves_with_stockfish(results, on_result)
+
+def visualize_selective_comparison(columns):
     """
     Creates and saves a plot comparing the Fixed A/B engine vs. the Selective engine.
+
+    Args:
+        columns (dict): Columnar results (see results_store.results_to_columns).
     """
     print("\nCreating Selective vs. Fixed A/B comparison plot...")
-    if not results: return
-
-    # Prepare data for plotting by counting how often each engine was better.
-    quality_stable = {'fixed': 0, 'selective': 0, 'equal': 0}
-    quality_unstable = {'fixed': 0, 'selective': 0, 'equal': 0}
-    for r in results:
-        is_unstable_pos = r.get("is_unstable", False)
-        fixed_score = r.get("fixed_true_score", 0)
-        selective_score = r.get("selective_true_score", 0)
-        
-        # Determine the winner based on the player's perspective.
-        if r.get("player_to_move") == 1: # White wants a higher score.
-            if selective_score > fixed_score: winner = 'selective'
-            elif fixed_score > selective_score: winner = 'fixed'
-            else: winner = 'equal'
-        else: # Black wants a lower score.
-            if selective_score < fixed_score: winner = 'selective'
-            elif fixed_score < selective_score: winner = 'fixed'
-            else: winner = 'equal'
-            
-        # Categorize the result based on the initial position's stability.
-        if is_unstable_pos: quality_unstable[winner] += 1
-        else: quality_stable[winner] += 1
+    if len(columns["board_id"]) == 0: return
+
+    # Count how often each engine was better (from the mover's perspective), split by stability.
+    rates = outcome_rates(columns, 'selective', 'fixed', group_by=("is_unstable",))
+    empty = {'selective': 0, 'fixed': 0, 'equal': 0}
+    quality_stable, quality_unstable = dict(empty), dict(empty)
+    for (is_unstable_pos,), r in rates.items():
+        quality = quality_unstable if is_unstable_pos else quality_stable
+        quality.update({'selective': r['a_better'], 'fixed': r['b_better'], 'equal': r['equal']})
             
     # Create the plots.
     fig, axes = plt.subplots(1, 2, figsize=(16, 7))
@@ -309,27 +375,22 @@ def visualize_selective_comparison(results):
     plt.savefig('selective_comparison.png')
     print("Selective comparison analysis saved to selective_comparison.png")
 
-def visualize_ab_comparison(results):
+def visualize_ab_comparison(columns):
     """
     Creates and saves a plot comparing the A/B Pruning engine vs. the Naive engine.
+
+    Args:
+        columns (dict): Columnar results (see results_store.results_to_columns).
     """
     print("\nCreating Alpha-Beta Pruning comparison plot...")
     
     # Sum the runtimes for each engine across all boards.
-    total_fixed_runtime = sum(r.get("fixed_runtime", 0) for r in results)
-    total_naive_runtime = sum(r.get("naive_runtime", 0) for r in results)
+    total_fixed_runtime = np.nansum(columns["fixed_runtime"])
+    total_naive_runtime = np.nansum(columns["naive_runtime"])
     
     # Compare move quality (should be identical).
-    quality = {'ab_better': 0, 'naive_better': 0, 'equal': 0}
-    for r in results:
-        if r.get("player_to_move") == 1:
-            if r.get("fixed_true_score", 0) > r.get("naive_true_score", 0): quality['ab_better'] += 1
-            elif r.get("naive_true_score", 0) > r.get("fixed_true_score", 0): quality['naive_better'] += 1
-            else: quality['equal'] += 1
-        else:
-            if r.get("fixed_true_score", 0) < r.get("naive_true_score", 0): quality['ab_better'] += 1
-            elif r.get("naive_true_score", 0) < r.get("fixed_true_score", 0): quality['naive_better'] += 1
-            else: quality['equal'] += 1
+    r = outcome_rates(columns, 'fixed', 'naive', group_by=()).get((), {'a_better': 0, 'b_better': 0, 'equal': 0})
+    quality = {'ab_better': r['a_better'], 'naive_better': r['b_better'], 'equal': r['equal']}
 
     # Create the plots.
     fig, axes = plt.subplots(1, 2, figsize=(16, 7))
@@ -356,40 +417,100 @@ def visualize_ab_comparison(results):
 # Main loop
 if __name__ == "__main__":
     start_total_time = time()
-    # Get all simulation settings from the user interactively
-    config = get_user_config()
+    args = parse_args()
+    profiler = None
+    if args.profile:
+        profiler = ProfileSession(args.profile, args.profile_dir, args.profile_top, args.profile_interval)
+    try:
+        results_log = ResultsLog(args.results, resume=args.resume, overwrite=args.overwrite)
+    except FileExistsError as e:
+        raise SystemExit(f"ERROR: {e}")
+
+    # A resumed run reuses the recorded settings, otherwise get them from the user interactively
+    if results_log.config:
+        config = results_log.config
+        print(f"Resuming with the recorded configuration: {config}")
+    else:
+        config = get_user_config()
+        results_log.write_config(config)
+
+    # Callbacks that append each finished board result to the results log
+    def record_search(r): results_log.record(RECORD_SEARCH, r, SEARCH_FIELDS)
+    def record_judge(r): results_log.record(RECORD_JUDGE, r, JUDGE_FIELDS)
+    def record_naive(r): results_log.record(RECORD_NAIVE, r, NAIVE_FIELDS)
 
     try:
-        # Step 1: Load the specified number of boards from the dataset.
-        boards_for_sim = load_boards_from_csv(DATASET_PATH, config['num_boards'])
+        # Step 1: Load the specified number of boards from the dataset, with anything already recorded.
+        boards_for_sim = results_log.restore(load_boards_from_csv(DATASET_PATH, config['num_boards']))
         
-        if boards_for_sim:
-            # Phase 1: Run the two primary engines (Fixed A/B, Selective) in parallel.
-            results_phase1 = run_simulations_parallel(get_engine_moves, boards_for_sim, "Phase 1 (Selective & Fixed A/B)", config['fixed_depth'], config['selective_depth'], evaluate_board)
+        if boards_for_sim and not args.sequential:
+            # Phases 1-3 as one pipeline: each board is judged as soon as its search (or naive search) finishes.
+            search_worker = profiler.wrap(get_engine_moves, PROFILE_PHASE_SEARCH) if profiler else get_engine_moves
+            naive_worker = None
+            if config['run_naive']:
+                naive_worker = profiler.wrap(get_naive_move, PROFILE_PHASE_NAIVE) if profiler else get_naive_move
+            # Only the judge coroutines are profiled in this process: the Pool is started from here, so a
+            # profiler active around the whole pipeline would also be active in the forked workers
+            profile_judge = (lambda judging: profiler.profile_coroutine(PROFILE_PHASE_JUDGE, judging)) if profiler else None
+            final_results, _ = run_pipeline(
+                boards_for_sim,
+                [b for b in boards_for_sim if not results_log.is_done(RECORD_SEARCH, b["board_id"])],
+                search_worker, (config['fixed_depth'], config['selective_depth'], evaluate_board),
+                [b for b in boards_for_sim if not results_log.is_done(RECORD_NAIVE, b["board_id"])],
+                naive_worker, (config['fixed_depth'], evaluate_board),
+                args.processes or default_processes(args.judges), args.judges, args.queue_size,
+                record_search, record_naive, record_judge, profile_judge=profile_judge
+            )
+
+            visualize_selective_comparison(results_to_columns(final_results, config['fixed_depth']))
+            if config['run_naive']:
+                visualize_ab_comparison(results_to_columns(final_results, config['fixed_depth']))
+
+        elif boards_for_sim:
+            # Phase 1: Run the two primary engines (Fixed A/B, Selective) in parallel on the boards not yet searched.
+            pending = [b for b in boards_for_sim if not results_log.is_done(RECORD_SEARCH, b["board_id"])]
+            searched = [b for b in boards_for_sim if results_log.is_done(RECORD_SEARCH, b["board_id"])]
+            if pending:
+                search_worker = profiler.wrap(get_engine_moves, PROFILE_PHASE_SEARCH) if profiler else get_engine_moves
+                searched += run_simulations_parallel(search_worker, pending, "Phase 1 (Selective & Fixed A/B)", config['fixed_depth'], config['selective_depth'], evaluate_board, on_result=record_search)
+            results_phase1 = sorted(searched, key=lambda r: r["board_id"])
             
             # Phase 2: Judge the results from Phase 1 using Stockfish.
-            judged_results1 = judge_all_moves_with_stockfish(results_phase1)
+            judged_results1 = judge_results(results_phase1, profiler, record_judge)
             
             # Create the first visualization based on the Phase 1/2 results.
             if judged_results1:
-                visualize_selective_comparison(judged_results1)
+                visualize_selective_comparison(results_to_columns(judged_results1, config['fixed_depth']))
 
             # Conditionally run the optional Phase 3 if the user selected 'y'.
             if config['run_naive']:
-                # Phase 3: Run the extremely slow naive minimax engine.
-                results_phase3 = run_simulations_parallel(get_naive_move, judged_results1, "Phase 3 (Naive Minimax)", config['fixed_depth'], evaluate_board)
+                # Phase 3: Run the extremely slow naive minimax engine on the boards not yet done.
+                pending = [b for b in judged_results1 if not results_log.is_done(RECORD_NAIVE, b["board_id"])]
+                results_phase3 = [b for b in judged_results1 if results_log.is_done(RECORD_NAIVE, b["board_id"])]
+                if pending:
+                    naive_worker = profiler.wrap(get_naive_move, PROFILE_PHASE_NAIVE) if profiler else get_naive_move
+                    results_phase3 += run_simulations_parallel(naive_worker, pending, "Phase 3 (Naive Minimax)", config['fixed_depth'], evaluate_board, on_result=record_naive)
+                results_phase3.sort(key=lambda r: r["board_id"])
                 
-                # Re-judge all results, now including the naive engine's move.
-                final_results = judge_all_moves_with_stockfish(results_phase3)
+                # Judge the naive engine's moves (moves judged in Phase 2 keep their scores).
+                final_results = judge_results(results_phase3, profiler, record_judge)
                 
                 # Create the second visualization comparing A/B pruning to the naive approach.
                 if final_results:
-                    visualize_ab_comparison(final_results)
+                    visualize_ab_comparison(results_to_columns(final_results, config['fixed_depth']))
 
     except Exception as e:
         # Graceful handling of exceptions
         print(f"\nAn unexpected error occurred during the main execution: {e}")
+        print(f"Finished results are saved in {args.results}; rerun with --resume to continue from there.")
     finally:
+        # Export everything recorded so far, even after an error or Ctrl-C.
+        if results_log.boards:
+            export_results_csv(results_log, args.csv)
+            save_columns(args.npz, results_to_columns(list(results_log.boards.values()), config['fixed_depth']))
+        # Merge the per-worker profiles into one report per phase.
+        if profiler:
+            profiler.merge_all()
         # Printing total run time and simulation completion 
         total_runtime = time() - start_total_time
         print(f"\nTotal wall-clock time for entire script: {total_runtime:.2f} seconds.")
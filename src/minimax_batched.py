@@ -0,0 +1,13 @@
+# minimax_batched.py
+
+from evaluation import evaluate_boards_batch
+from minimax import FIXED_DEPTH_CONFIG
+from search import search
+
+# The fixed-depth preset with the children of each depth-1 node evaluated together in one batched call
+BATCHED_CONFIG = FIXED_DEPTH_CONFIG.replace(batched_frontier=True)
+
+# Finds the best move using fixed-depth negamax search, evaluating frontier children in batches.
+# evaluate_batch_fn takes a list of boards and returns their scores from white's perspective.
+def find_best_move_batched(board_state, player_to_move, depth, evaluate_batch_fn=evaluate_boards_batch):
+    return search(board_state, player_to_move, depth, evaluate_batch_fn, BATCHED_CONFIG)
@@ -0,0 +1,223 @@
+# pipeline.py
+# Streaming execution of the simulation phases.
+# Board results of the search (Phase 1) and naive (Phase 3) workers flow from the process pool to the
+# Stockfish judge (Phase 2) through a bounded asyncio queue, so judging overlaps with searching and the
+# wall time approaches that of the slowest stage instead of the sum of all stages. When the judge falls
+# behind, the queue fills up and no new searches are started until it catches up (backpressure).
+
+import asyncio
+from multiprocessing import Pool, cpu_count
+from time import time
+
+import chess.engine
+
+from board import apply_move
+from arbiter import get_stockfish_evaluation_async, STOCKFISH_PATH
+from results_log import SEARCH_FIELDS, NAIVE_FIELDS
+from results_store import ENGINES
+
+DEFAULT_JUDGES = 1 # Stockfish instances judging concurrently
+PROGRESS_INTERVAL = 10 # Print a progress line every this many judged boards
+ENGINE_QUIT_TIMEOUT = 2.0 # Seconds a judge waits for Stockfish to quit
+
+def default_processes(judges=DEFAULT_JUDGES):
+    # Leave a core to each Stockfish instance, so judging does not slow down the timed searches
+    return max(1, cpu_count() - judges)
+
+def run_task(task):
+    """
+    Unpacks a (worker_fn, args) pair inside a Pool process, since the Pool methods pass a single argument.
+    """
+    worker_fn, args = task
+    return worker_fn(*args)
+
+def submit(pool, loop, worker_fn, args):
+    """
+    Runs worker_fn(*args) in a Pool process.
+
+    Returns:
+        asyncio.Future: Resolved on the event loop with the worker's result (or its exception).
+    """
+    future = loop.create_future()
+
+    def resolve(method, value):
+        if not future.done(): method(value)
+
+    pool.apply_async(run_task, ((worker_fn, args),),
+                     callback=lambda result: loop.call_soon_threadsafe(resolve, future.set_result, result),
+                     error_callback=lambda error: loop.call_soon_threadsafe(resolve, future.set_exception, error))
+    return future
+
+def needs_judging(board_data):
+    """
+    Names of the engines whose move on this board has not been scored by Stockfish yet.
+    """
+    return [engine for engine in ENGINES
+            if board_data.get(f"{engine}_best_move") and f"{engine}_true_score" not in board_data]
+
+class PipelineStats:
+    """
+    Busy time of each stage, to compare the wall time against the slowest stage.
+    """
+    def __init__(self, processes, judges):
+        self.processes = processes
+        self.judges = judges
+        self.search_time = 0.0 # Summed runtimes of the search workers
+        self.naive_time = 0.0 # Summed runtimes of the naive workers
+        self.judge_time = 0.0 # Summed time spent waiting on Stockfish
+        self.judged = 0
+        self.wall_time = 0.0
+
+    def print_summary(self):
+        search_stage = (self.search_time + self.naive_time) / self.processes
+        judge_stage = self.judge_time / self.judges
+        print(f"Pipeline complete in {self.wall_time:.2f} seconds. Busy time per stage: "
+              f"search {search_stage:.2f}s ({self.processes} process(es)), judge {judge_stage:.2f}s "
+              f"({self.judges} Stockfish instance(s)); the stages in sequence would take {search_stage + judge_stage:.2f}s.")
+
+async def run_pipeline_async(boards_data, search_boards, search_worker, search_args, naive_boards=(), naive_worker=None,
+                             naive_args=(), processes=None, judges=DEFAULT_JUDGES, queue_size=None,
+                             on_search=None, on_naive=None, on_judge=None, engine_path=STOCKFISH_PATH, profile_judge=None):
+    """
+    Searches, naive-searches and judges the boards as one streaming pipeline.
+
+    Args:
+        boards_data (list): Every board of the run. Boards that already carry unjudged moves (e.g. restored
+            from the results log) are judged first.
+        search_boards (list): Boards to run search_worker on (Phase 1).
+        search_worker (function): Worker returning the board with the fixed and selective results.
+        search_args (tuple): Extra arguments of search_worker.
+        naive_boards (list): Boards to run naive_worker on (Phase 3), started once every search is submitted.
+        naive_worker (function): Worker returning the board with the naive results.
+        naive_args (tuple): Extra arguments of naive_worker.
+        processes (int): Pool size; defaults to default_processes(judges).
+        judges (int): Number of Stockfish instances consuming the queue.
+        queue_size (int): Capacity of the judge queue; defaults to twice the pool size.
+        on_search, on_naive, on_judge (function): Callbacks receiving the board after each stage.
+        engine_path (str): Path of the Stockfish binary.
+        profile_judge (function): Optional wrapper receiving each judge coroutine and returning the awaitable
+            to run instead (e.g. ProfileSession.profile_coroutine for one phase). Only the judge is profiled in
+            this process; the workers profile the searches themselves.
+
+    Returns:
+        tuple: (board results ordered by board_id, PipelineStats).
+    """
+    processes = processes or default_processes(judges)
+    queue = asyncio.Queue(maxsize=queue_size or 2 * processes)
+    # One slot per pool process: a finished search holds its slot until its board is queued, so a full
+    # queue stops new searches from being submitted
+    slots = asyncio.Semaphore(processes)
+    boards_by_id = {b["board_id"]: b for b in boards_data}
+    claimed = set() # (board_id, engine) pairs being judged, so two judges never score the same move
+    stats = PipelineStats(processes, judges)
+    loop = asyncio.get_running_loop()
+    start_time = time()
+
+    # Workers get a shallow copy of the board, since Pool pickles the arguments on another thread
+    # while the judges may still be adding scores to the board
+    async def run_job(pool, stage, board):
+        try:
+            if stage == 'search':
+                result = await submit(pool, loop, search_worker, (dict(board), *search_args))
+                stats.search_time += result["fixed_runtime"] + result["selective_runtime"]
+                fields, on_result = SEARCH_FIELDS, on_search
+            else:
+                result = await submit(pool, loop, naive_worker, (dict(board), *naive_args))
+                stats.naive_time += result["naive_runtime"]
+                fields, on_result = NAIVE_FIELDS, on_naive
+            # The worker returns a copy of the board: merge its new fields into the board being judged
+            board_data = boards_by_id[result["board_id"]]
+            board_data.update({field: result[field] for field in fields if field in result})
+            if on_result: on_result(board_data)
+            await queue.put(board_data["board_id"])
+        finally:
+            slots.release()
+
+    async def produce(pool):
+        searching = {b["board_id"] for b in search_boards}
+        for board_data in boards_data:
+            if board_data["board_id"] not in searching and needs_judging(board_data):
+                await queue.put(board_data["board_id"])
+        jobs = [('search', b) for b in search_boards]
+        if naive_worker:
+            jobs += [('naive', b) for b in naive_boards]
+        tasks = []
+        try:
+            for stage, board in jobs:
+                await slots.acquire()
+                tasks.append(asyncio.ensure_future(run_job(pool, stage, board)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks: task.cancel()
+
+    async def judge():
+        transport, engine = await chess.engine.popen_uci(engine_path)
+        try:
+            while True:
+                board_id = await queue.get()
+                try:
+                    if engine is not None:
+                        judging = judge_board(engine, boards_by_id[board_id])
+                        engine = await (profile_judge(judging) if profile_judge else judging)
+                finally:
+                    queue.task_done()
+        finally:
+            # A Ctrl-C reaches Stockfish too, so a clean shutdown is not waited for indefinitely
+            if engine is not None:
+                try:
+                    await asyncio.wait_for(engine.quit(), ENGINE_QUIT_TIMEOUT)
+                except (asyncio.TimeoutError, chess.engine.EngineError):
+                    pass
+            transport.close()
+
+    async def judge_board(engine, board_data):
+        engines = [e for e in needs_judging(board_data) if (board_data["board_id"], e) not in claimed]
+        if not engines: return engine
+        claimed.update((board_data["board_id"], e) for e in engines)
+        judge_start = time()
+        try:
+            for name in engines:
+                board, next_player = apply_move(board_data["board_state"], board_data[f"{name}_best_move"], board_data["player_to_move"])
+                board_data[f"{name}_true_score"] = await get_stockfish_evaluation_async(board, next_player, engine)
+        except chess.engine.EngineTerminatedError as e:
+            # Keep searching; the unjudged moves are judged when the run is resumed
+            print(f"\nFATAL ERROR: Stockfish terminated. {e}")
+            return None
+        finally:
+            stats.judge_time += time() - judge_start
+            claimed.difference_update((board_data["board_id"], e) for e in engines)
+        stats.judged += 1
+        if on_judge: on_judge(board_data)
+        if stats.judged % PROGRESS_INTERVAL == 0: print(f"  Judged {stats.judged} positions...")
+        return engine
+
+    print(f"\nPipeline: searching {len(search_boards)} boards" + (f" and {len(naive_boards)} naive" if naive_worker else "") +
+          f" on {processes} processes while {judges} Stockfish instance(s) judge (queue size {queue.maxsize})...")
+    judge_tasks = [asyncio.ensure_future(judge()) for _ in range(judges)]
+
+    async def until_done_or_judge_fails(coroutine):
+        # Judges only stop on an error (e.g. Stockfish failing to start), which is raised here
+        task = asyncio.ensure_future(coroutine)
+        try:
+            done, _ = await asyncio.wait([task, *judge_tasks], return_when=asyncio.FIRST_COMPLETED)
+            for finished in done: finished.result()
+        finally:
+            task.cancel()
+
+    try:
+        with Pool(processes=processes) as pool:
+            await until_done_or_judge_fails(produce(pool))
+        await until_done_or_judge_fails(queue.join())
+    finally:
+        for task in judge_tasks: task.cancel()
+        await asyncio.gather(*judge_tasks, return_exceptions=True)
+
+    stats.wall_time = time() - start_time
+    stats.print_summary()
+    return sorted(boards_by_id.values(), key=lambda r: r["board_id"]), stats
+
+def run_pipeline(*args, **kwargs):
+    """
+    Synchronous entry point of run_pipeline_async (same arguments).
+    """
+    return asyncio.run(run_pipeline_async(*args, **kwargs))
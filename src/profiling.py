@@ -0,0 +1,234 @@
+# profiling.py
+# Optional profiling support for the simulation phases.
+# Every task executed by a Pool worker is wrapped in a collector, each worker process dumps its
+# own stats file, and the files of a phase are merged afterwards into a single .prof report.
+
+import cProfile
+import glob
+import marshal
+import os
+import pstats
+import signal
+from collections import Counter
+
+PROFILE_MODES = ('cprofile', 'sample')
+DEFAULT_PROFILE_DIR = 'profiles'
+DEFAULT_SAMPLE_INTERVAL = 0.005 # Seconds of CPU time between two stack samples
+DEFAULT_TOP_N = 20
+
+# Collectors that live in the current process, keyed by (phase, output_dir, mode).
+# Pool workers keep theirs for the lifetime of the worker so stats accumulate across tasks.
+_collectors = {}
+
+def _frame_key(code):
+    # Same (filename, line, function) key format that pstats uses
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+class SamplingCollector:
+    """
+    A low-overhead statistical profiler.
+    A SIGPROF timer interrupts the process every `interval` seconds of CPU time and the current
+    Python stack is recorded. Only the sampled stacks are stored, so the cost does not grow with
+    the number of function calls the engines make.
+    The collected samples are written in the pstats format so they can be merged and browsed
+    exactly like cProfile output (times are estimated as samples * interval).
+    """
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.self_samples = Counter()
+        self.total_samples = Counter()
+        self.caller_samples = Counter()
+
+    def _on_sample(self, signum, frame):
+        seen = set()
+        child = None
+        while frame is not None:
+            key = _frame_key(frame.f_code)
+            if child is None:
+                self.self_samples[key] += 1
+            if key not in seen: # Recursive frames count once per sample
+                self.total_samples[key] += 1
+                seen.add(key)
+            if child is not None:
+                self.caller_samples[(key, child)] += 1
+            child = key
+            frame = frame.f_back
+
+    def enable(self):
+        signal.signal(signal.SIGPROF, self._on_sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def disable(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+
+    def dump_stats(self, file_path):
+        # pstats cannot load an empty profile, so nothing is written until a sample was taken
+        if not self.total_samples: return
+        stats = {}
+        for key, total in self.total_samples.items():
+            self_time = self.self_samples[key] * self.interval
+            stats[key] = (total, total, self_time, total * self.interval, {})
+        for (caller, callee), count in self.caller_samples.items():
+            stats[callee][4][caller] = (count, count, 0.0, count * self.interval)
+        with open(file_path, 'wb') as f:
+            marshal.dump(stats, f)
+
+def _make_collector(mode, interval):
+    if mode == 'sample':
+        return SamplingCollector(interval)
+    return cProfile.Profile()
+
+def _worker_stats_path(output_dir, phase):
+    return os.path.join(output_dir, f"{phase}.{os.getpid()}.prof")
+
+def _collector_for(phase, output_dir, mode, interval):
+    key = (phase, output_dir, mode)
+    collector = _collectors.get(key)
+    if collector is None:
+        collector = _collectors[key] = _make_collector(mode, interval)
+    return collector
+
+def profile_call(fn, args, phase, output_dir, mode, interval):
+    """
+    Runs fn(*args) under this process's collector for the given phase and dumps the
+    accumulated stats of this process to its per-worker file.
+    """
+    collector = _collector_for(phase, output_dir, mode, interval)
+    collector.enable()
+    try:
+        return fn(*args)
+    finally:
+        collector.disable()
+        # Pool workers have no reliable exit hook, so the running totals are written after every task.
+        collector.dump_stats(_worker_stats_path(output_dir, phase))
+
+class ProfiledCoroutine:
+    """
+    Awaits a coroutine with the collector enabled only while the coroutine itself runs. Whatever else the
+    event loop runs in between (other tasks, callbacks) is not attributed to it, so the coroutine can be
+    profiled on its own while other stages of an asyncio program keep running.
+    """
+    def __init__(self, coroutine, collector, stats_path):
+        self.coroutine = coroutine
+        self.collector = collector
+        self.stats_path = stats_path
+
+    def __await__(self):
+        value, error = None, None
+        try:
+            while True:
+                self.collector.enable()
+                try:
+                    yielded = self.coroutine.throw(error) if error is not None else self.coroutine.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    self.collector.disable()
+                try:
+                    value, error = (yield yielded), None
+                except GeneratorExit:
+                    self.coroutine.close()
+                    raise
+                except BaseException as e: # e.g. asyncio.CancelledError, passed on to the coroutine
+                    value, error = None, e
+        finally:
+            self.collector.dump_stats(self.stats_path)
+
+class ProfiledWorker:
+    """
+    A picklable wrapper around a Pool worker function that profiles every task it runs.
+    """
+    def __init__(self, worker_fn, phase, output_dir, mode, interval):
+        self.worker_fn = worker_fn
+        self.phase = phase
+        self.output_dir = output_dir
+        self.mode = mode
+        self.interval = interval
+
+    def __call__(self, *args):
+        return profile_call(self.worker_fn, args, self.phase, self.output_dir, self.mode, self.interval)
+
+class ProfileSession:
+    """
+    Collects per-worker profiles for each simulation phase and merges them into one report per phase.
+
+    Args:
+        mode (str): 'cprofile' for exact deterministic profiling, 'sample' for the low-overhead sampler.
+        output_dir (str): Directory receiving the per-worker files and the merged reports.
+        top_n (int): Number of functions listed in each hot-function summary.
+        interval (float): Sampling interval in seconds (sample mode only).
+    """
+    def __init__(self, mode='cprofile', output_dir=DEFAULT_PROFILE_DIR, top_n=DEFAULT_TOP_N, interval=DEFAULT_SAMPLE_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.interval = interval
+        self._started_phases = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _begin_phase(self, phase):
+        # Remove worker files left behind by an earlier run, but keep the ones from this run
+        # so a phase that is entered twice (e.g. judging) accumulates into one report.
+        if phase in self._started_phases: return
+        self._started_phases.append(phase)
+        for stale in glob.glob(os.path.join(self.output_dir, f"{phase}.*.prof")):
+            os.remove(stale)
+
+    def wrap(self, worker_fn, phase):
+        """Returns a picklable worker that profiles each task it runs in a Pool process."""
+        self._begin_phase(phase)
+        return ProfiledWorker(worker_fn, phase, self.output_dir, self.mode, self.interval)
+
+    def run(self, phase, fn, *args):
+        """Profiles a call made in the current process (e.g. the sequential Stockfish judge)."""
+        self._begin_phase(phase)
+        return profile_call(fn, args, phase, self.output_dir, self.mode, self.interval)
+
+    def profile_coroutine(self, phase, coroutine):
+        """Returns an awaitable running the coroutine under the phase's collector in the current process (e.g. the pipeline's judge)."""
+        self._begin_phase(phase)
+        collector = _collector_for(phase, self.output_dir, self.mode, self.interval)
+        return ProfiledCoroutine(coroutine, collector, _worker_stats_path(self.output_dir, phase))
+
+    def merge(self, phase):
+        """
+        Merges all per-worker files of a phase into <output_dir>/<phase>.prof and prints
+        a short hot-function summary, which is also saved next to it as <phase>.txt.
+
+        Returns:
+            str: The path of the merged .prof file, or None if the phase produced no stats.
+        """
+        worker_files = sorted(glob.glob(os.path.join(self.output_dir, f"{phase}.*.prof")))
+        if not worker_files:
+            print(f"No profile data was collected for {phase}.")
+            return None
+        stats = pstats.Stats(*worker_files)
+        merged_path = os.path.join(self.output_dir, f"{phase}.prof")
+        stats.dump_stats(merged_path)
+
+        summary = format_hot_functions(stats, self.top_n, 'samples' if self.mode == 'sample' else 'calls')
+        header = f"{phase}: {len(worker_files)} worker profile(s) merged ({self.mode} mode)"
+        with open(os.path.join(self.output_dir, f"{phase}.txt"), 'w') as f:
+            f.write(header + "\n" + summary + "\n")
+        print(f"\n{header} -> {merged_path}")
+        print(summary)
+        return merged_path
+
+    def merge_all(self):
+        """Merges every phase profiled in this session, in the order the phases were started."""
+        return [self.merge(phase) for phase in self._started_phases]
+
+def format_hot_functions(stats, top_n=DEFAULT_TOP_N, count_label='calls'):
+    """
+    Formats the top_n functions of a pstats.Stats object ordered by their own (self) time.
+    count_label names the count column: 'calls' for cProfile, 'samples' for the sampler, which
+    stores sample counts where cProfile stores call counts.
+    """
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top_n]
+    lines = [f"{'self (s)':>10} {'cum (s)':>10} {count_label:>10}  function"]
+    for (filename, line, func_name), (_, num_calls, self_time, cum_time, _) in rows:
+        location = f"{os.path.basename(filename)}:{line}({func_name})"
+        lines.append(f"{self_time:>10.3f} {cum_time:>10.3f} {num_calls:>10}  {location}")
+    return "\n".join(lines)
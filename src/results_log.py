@@ -0,0 +1,152 @@
+# results_log.py
+# Append-only JSONL log of simulation results.
+# Every finished board result is written (and flushed) as soon as it completes, so a crash or a
+# Ctrl-C only loses the boards that were in flight, and a --resume run can skip everything recorded.
+
+import csv
+import json
+import math
+import os
+
+DEFAULT_RESULTS_LOG_PATH = 'simulation_results.jsonl'
+DEFAULT_RESULTS_CSV_PATH = 'simulation_results.csv'
+
+# Record types written to the log
+RECORD_CONFIG = 'config' # The run configuration, always the first line
+RECORD_SEARCH = 'search' # Phase 1: fixed A/B and selective moves for one board
+RECORD_JUDGE = 'judge' # Phase 2: Stockfish scores for one board
+RECORD_NAIVE = 'naive' # Phase 3: naive minimax move for one board
+
+# Fields kept from a board dictionary for each record type
+SEARCH_FIELDS = ("player_to_move", "is_unstable", "stability_reason",
+                 "fixed_best_move", "fixed_score", "fixed_runtime", "selective_best_move", "selective_score", "selective_runtime")
+JUDGE_FIELDS = ("fixed_true_score", "selective_true_score", "naive_true_score")
+NAIVE_FIELDS = ("naive_best_move", "naive_score", "naive_runtime")
+MOVE_FIELDS = ("fixed_best_move", "selective_best_move", "naive_best_move")
+
+# Column order of the exported CSV
+CSV_COLUMNS = [
+    "board_id", "player_to_move", "is_unstable_pos", "stability_reason",
+    "fixed_best_move", "fixed_score", "fixed_runtime_sec", "fixed_true_score",
+    "selective_best_move", "selective_score", "selective_runtime_sec", "selective_true_score",
+    "naive_best_move", "naive_score", "naive_runtime_sec", "naive_true_score"
+]
+
+def _move_from_json(move):
+    # JSON turns the ((row, col), (row, col)) tuples into nested lists
+    return tuple(tuple(square) for square in move) if move is not None else None
+
+def _finite_or_none(value):
+    return None if isinstance(value, float) and not math.isfinite(value) else value
+
+class ResultsLog:
+    """
+    An append-only JSONL file holding one record per completed board and phase.
+
+    Args:
+        path (str): Path of the .jsonl log.
+        resume (bool): Keep and read the existing log instead of starting a new one.
+        overwrite (bool): Start a new log even if one already exists at path. Without it (or resume)
+            an existing log raises FileExistsError, so the results of an interrupted run are never lost
+            to a forgotten --resume.
+    """
+    def __init__(self, path=DEFAULT_RESULTS_LOG_PATH, resume=False, overwrite=False):
+        self.path = path
+        self.config = None
+        self.boards = {} # board_id -> merged fields of every record for that board
+        self.completed = {RECORD_SEARCH: set(), RECORD_JUDGE: set(), RECORD_NAIVE: set()}
+        self._truncate = False # Empty the previous log on the first write, not before the run starts
+        if resume and os.path.exists(path):
+            self._load()
+        elif os.path.exists(path):
+            if not overwrite:
+                raise FileExistsError(f"{path} already holds results; rerun with --resume to continue that run, "
+                                      f"or with --overwrite to start a new one.")
+            print(f"Starting a new results log; the previous {path} will be overwritten.")
+            self._truncate = True
+
+    def _load(self):
+        self._truncate_torn_line()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Most likely the last line, cut short by the crash we are resuming from
+                    print(f"Skipping unreadable line {line_number} of {self.path}.")
+                    continue
+                self._apply(record)
+        print(f"Resuming from {self.path}: {len(self.completed[RECORD_SEARCH])} searched, "
+              f"{len(self.completed[RECORD_JUDGE])} judged, {len(self.completed[RECORD_NAIVE])} naive board(s) recorded.")
+
+    def _truncate_torn_line(self):
+        # A crash in the middle of a write leaves a last line without its newline. Cut it off, since
+        # the next record would otherwise be appended to it and be lost with it.
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                print(f"Removed an incomplete last record from {self.path}.")
+
+    def _apply(self, record):
+        kind = record.pop("record")
+        if kind == RECORD_CONFIG:
+            self.config = record["config"]
+            return
+        board_id = record["board_id"]
+        for field in MOVE_FIELDS:
+            if field in record:
+                record[field] = _move_from_json(record[field])
+        self.boards.setdefault(board_id, {}).update(record)
+        self.completed[kind].add(board_id)
+
+    def _append(self, record):
+        with open(self.path, 'w' if self._truncate else 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, allow_nan=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._truncate = False
+        self._apply(dict(record))
+
+    def write_config(self, config):
+        self._append({"record": RECORD_CONFIG, "config": config})
+
+    def record(self, kind, board_data, fields):
+        """
+        Appends one record holding the given fields of a board dictionary (missing fields are skipped).
+        Infinite scores (a root without legal moves) are stored as null, since JSON has no infinity.
+        """
+        record = {"record": kind, "board_id": board_data["board_id"]}
+        record.update({field: _finite_or_none(board_data[field]) for field in fields if field in board_data})
+        self._append(record)
+
+    def is_done(self, kind, board_id):
+        return board_id in self.completed[kind]
+
+    def restore(self, boards_data):
+        """
+        Copies the recorded fields back into freshly loaded board dictionaries.
+        """
+        for board_data in boards_data:
+            board_data.update(self.boards.get(board_data["board_id"], {}))
+        return boards_data
+
+def export_results_csv(results_log, csv_path=DEFAULT_RESULTS_CSV_PATH):
+    """
+    Writes one CSV row per board recorded in the results log.
+    """
+    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for board_id, r in sorted(results_log.boards.items()):
+            writer.writerow({
+                "board_id": board_id, "player_to_move": r.get("player_to_move"),
+                "is_unstable_pos": r.get("is_unstable"), "stability_reason": r.get("stability_reason"),
+                "fixed_best_move": r.get("fixed_best_move"), "fixed_score": r.get("fixed_score"),
+                "fixed_runtime_sec": r.get("fixed_runtime"), "fixed_true_score": r.get("fixed_true_score"),
+                "selective_best_move": r.get("selective_best_move"), "selective_score": r.get("selective_score"),
+                "selective_runtime_sec": r.get("selective_runtime"), "selective_true_score": r.get("selective_true_score"),
+                "naive_best_move": r.get("naive_best_move"), "naive_score": r.get("naive_score"),
+                "naive_runtime_sec": r.get("naive_runtime"), "naive_true_score": r.get("naive_true_score"),
+            })
+    print(f"Results exported to {csv_path}")
@@ -0,0 +1,102 @@
+# results_store.py
+# Columnar storage of simulation results.
+# A run is held as one NumPy array per field and saved as a single .npz file, so large runs can be
+# analysed (and many runs combined) without building a Python dictionary per board.
+
+import numpy as np
+
+from evaluation import STABLE, IN_CHECK, CAPTURE_AVAILABLE, PIECE_HANGING
+
+DEFAULT_RESULTS_NPZ_PATH = 'simulation_results.npz'
+
+# Stability reasons are stored as small integer codes (index in this tuple, -1 if unknown)
+STABILITY_REASONS = (STABLE, IN_CHECK, CAPTURE_AVAILABLE, PIECE_HANGING)
+ENGINES = ('fixed', 'selective', 'naive')
+NO_MOVE = -1 # Stored move code when an engine found no move (or did not run)
+
+# Column name -> dtype. Missing floats are stored as NaN.
+COLUMNS = {
+    "run": np.int32, # Index of the run, assigned when several runs are combined
+    "board_id": np.int32,
+    "depth": np.int16,
+    "player_to_move": np.int8,
+    "is_unstable": np.bool_,
+    "stability_reason": np.int8,
+}
+for _engine in ENGINES:
+    COLUMNS[f"{_engine}_move"] = np.int16 # from_square * 64 + to_square, squares numbered row * 8 + col
+    COLUMNS[f"{_engine}_score"] = np.float64
+    COLUMNS[f"{_engine}_runtime"] = np.float64
+    COLUMNS[f"{_engine}_true_score"] = np.float64
+
+def _missing_value(name, dtype):
+    if np.issubdtype(dtype, np.floating): return np.nan
+    if name.endswith("_move"): return NO_MOVE
+    if name == "stability_reason": return -1
+    return 0
+
+def encode_move(move):
+    if move is None: return NO_MOVE
+    (from_r, from_c), (to_r, to_c) = move
+    return (from_r * 8 + from_c) * 64 + to_r * 8 + to_c
+
+def decode_move(code):
+    if code == NO_MOVE: return None
+    from_sq, to_sq = divmod(int(code), 64)
+    return (divmod(from_sq, 8), divmod(to_sq, 8))
+
+def results_to_columns(results, depth, run=0):
+    """
+    Converts board result dictionaries into column arrays.
+
+    Args:
+        results (list): Board result dictionaries as produced by main.py.
+        depth (int): Search depth used for the run.
+        run (int): Run index stored in the "run" column.
+
+    Returns:
+        dict: Column name -> np.ndarray, one row per board.
+    """
+    n = len(results)
+    columns = {name: np.empty(n, dtype=dtype) for name, dtype in COLUMNS.items()}
+    columns["run"][:] = run
+    columns["depth"][:] = depth
+    reason_codes = {reason: code for code, reason in enumerate(STABILITY_REASONS)}
+    for i, r in enumerate(results):
+        columns["board_id"][i] = r["board_id"]
+        columns["player_to_move"][i] = r["player_to_move"]
+        columns["is_unstable"][i] = r.get("is_unstable", False)
+        columns["stability_reason"][i] = reason_codes.get(r.get("stability_reason"), -1)
+        for engine in ENGINES:
+            columns[f"{engine}_move"][i] = encode_move(r.get(f"{engine}_best_move"))
+            for field in ("score", "runtime", "true_score"):
+                value = r.get(f"{engine}_{field}")
+                columns[f"{engine}_{field}"][i] = np.nan if value is None else value
+    return columns
+
+def save_columns(path, columns):
+    np.savez_compressed(path, **columns)
+    print(f"Columnar results saved to {path}")
+
+def load_columns(paths):
+    """
+    Loads one or more saved runs and concatenates them column by column.
+    Each file gets its own run index in the "run" column, in the order given.
+
+    Returns:
+        dict: Column name -> np.ndarray covering every row of every run.
+    """
+    if isinstance(paths, str): paths = [paths]
+    parts = {name: [] for name in COLUMNS}
+    for run, path in enumerate(paths):
+        with np.load(path) as data:
+            n = len(data["board_id"])
+            for name, dtype in COLUMNS.items():
+                if name == "run":
+                    parts[name].append(np.full(n, run, dtype=dtype))
+                elif name in data:
+                    parts[name].append(data[name].astype(dtype, copy=False))
+                else:
+                    # Files written before a column existed: fill it with its missing value
+                    parts[name].append(np.full(n, _missing_value(name, dtype), dtype=dtype))
+    return {name: (np.concatenate(arrays) if arrays else np.empty(0, dtype=COLUMNS[name])) for name, arrays in parts.items()}
@@ -0,0 +1,301 @@
+# search.py
+# Configurable negamax search core shared by the engines.
+# The fixed-depth, selective and naive engines are presets of one search whose features (alpha-beta
+# pruning, quiescence, move ordering, transposition table, endgame bitbases) are switched by a SearchConfig, so every
+# optimization is written once and each feature can be measured on its own (see ablation.py).
+
+from board import EMPTY, apply_move, generate_legal_moves, generate_pseudo_legal_moves, has_legal_move, is_capture_move, is_legal_move, is_king_in_check, player_value_to_color_str
+from evaluation_cache import position_key
+from bitbase import DRAW, LOSS, PROBE_PIECES, default_bitbases, probe, table_name
+
+MATE_SCORE = 100000 # High score used to represent checkmate
+DRAW_SCORE = 0 # Score of a stalemate
+KNOWN_WIN_SCORE = MATE_SCORE // 2 # Score of a bitbase win, below any mate found by the search
+
+# Move ordering modes
+ORDER_NONE = 'none' # Moves are searched in generation order
+ORDER_ROOT = 'root' # Captures first at the root only
+ORDER_ALL = 'all' # Captures first at every node (and the transposition table move first, when enabled)
+MOVE_ORDERINGS = (ORDER_NONE, ORDER_ROOT, ORDER_ALL)
+
+# Bound types of transposition table entries
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+class SearchConfig:
+    """
+    Features of one search configuration.
+
+    Args:
+        alpha_beta (bool): Prune with alpha-beta (fail-hard). Without it every move of every node is searched.
+        quiescence_depth (int): Capture-only plies searched below the horizon, 0 for a plain static evaluation.
+        move_ordering (str): One of MOVE_ORDERINGS.
+        transposition_table (bool): Reuse the results of positions reached through different move orders.
+            Entries are only reused at the same remaining depth, so the table never changes the result.
+        bitbases (bool): Stop searching positions covered by the generated endgame bitbases (see bitbase.py).
+            Their score is KNOWN_WIN_SCORE plus the remaining depth plus the static evaluation, so the search
+            still prefers progress and reaches a known win (e.g. a promotion) as early as it can.
+        batched_frontier (bool): evaluate_fn takes a list of boards and returns their scores (e.g.
+            evaluation.evaluate_boards_batch). The children of each depth-1 node are evaluated in one call and
+            visited best static score first, so cutoffs come early. Needs quiescence_depth=0, since quiescence
+            evaluates the children one by one.
+    """
+    def __init__(self, alpha_beta=True, quiescence_depth=0, move_ordering=ORDER_ROOT, transposition_table=False, bitbases=False,
+                 batched_frontier=False):
+        if move_ordering not in MOVE_ORDERINGS:
+            raise ValueError(f"Unknown move ordering '{move_ordering}', expected one of {MOVE_ORDERINGS}")
+        if quiescence_depth < 0:
+            raise ValueError("quiescence_depth must not be negative")
+        if batched_frontier and quiescence_depth:
+            raise ValueError("batched_frontier needs quiescence_depth=0")
+        self.alpha_beta = alpha_beta
+        self.quiescence_depth = quiescence_depth
+        self.move_ordering = move_ordering
+        self.transposition_table = transposition_table
+        self.bitbases = bitbases
+        self.batched_frontier = batched_frontier
+
+    def replace(self, **changes):
+        """
+        Returns a copy of this configuration with some features changed.
+        """
+        features = dict(vars(self))
+        features.update(changes)
+        return SearchConfig(**features)
+
+    def __repr__(self):
+        return "SearchConfig(" + ", ".join(f"{name}={value!r}" for name, value in vars(self).items()) + ")"
+
+# Captures before quiet moves, keeping the generation order within each group
+def order_captures_first(board, moves):
+    return sorted(moves, key=lambda move: is_capture_move(board, move), reverse=True)
+
+def search(board_state, player_to_move, depth, evaluate_fn, config):
+    """
+    Finds the best move with negamax search under the given configuration.
+
+    Args:
+        board_state (list): 8x8 board.
+        player_to_move (int): 1 for white, -1 for black.
+        depth (int): Search depth in plies.
+        evaluate_fn (function): Static evaluation from white's perspective (of a list of boards with batched_frontier).
+        config (SearchConfig): Features to use.
+
+    Returns:
+        dict: {"best_move", "score", "nodes"} where nodes counts the root and every position searched below it.
+    """
+    alpha_beta = config.alpha_beta
+    quiescence_depth = config.quiescence_depth
+    order_all = config.move_ordering == ORDER_ALL
+    table = {} if config.transposition_table else None
+    bitbases = (default_bitbases() or None) if config.bitbases else None
+    batched = config.batched_frontier
+    if batched:
+        evaluate_batch_fn = evaluate_fn
+        evaluate_fn = lambda board: int(evaluate_batch_fn([board])[0])
+    nodes = 1
+    root_table = None # Table covering the root, whose positions are searched instead of probed
+
+    # Score of a position covered by the bitbases (None if it is not), clamped to the window like a searched node.
+    # Only positions with PROBE_PIECES pieces left can be covered, so the others are not looked up.
+    # depth_left is the position's remaining depth (0 at and below the horizon): a win reached with more
+    # depth left was reached sooner and scores higher, like a shorter mate.
+    def bitbase_score(board, player, alpha, beta, pieces, depth_left):
+        if pieces != PROBE_PIECES:
+            return None
+        if root_table is not None and table_name(board) == root_table:
+            return None
+        result = probe(bitbases, board, player)
+        if result is None:
+            return None
+        if result == DRAW:
+            score = DRAW_SCORE
+        elif result == LOSS and not has_legal_move(board, player):
+            score = terminal_score(board, player) # Checkmated: keep the mate score so mates are still found
+        else:
+            score = result * (KNOWN_WIN_SCORE + depth_left) + player * evaluate_fn(board)
+        return max(alpha, min(beta, score))
+
+    # Extend the search with captures only, until the position is quiet or the budget runs out
+    def quiescence(board, player, depth, alpha, beta, pieces):
+        nonlocal nodes
+        if bitbases is not None:
+            score = bitbase_score(board, player, alpha, beta, pieces, 0)
+            if score is not None:
+                return score
+        stand_pat_score = player * evaluate_fn(board)
+        if depth == 0:
+            return stand_pat_score
+        if stand_pat_score >= beta:
+            return beta
+        alpha = max(alpha, stand_pat_score)
+        # Legality is only tested for captures
+        capture_moves = [move for move in generate_pseudo_legal_moves(board, player)
+                         if is_capture_move(board, move) and is_legal_move(board, move, player)]
+        for move in capture_moves:
+            child_board, next_player = apply_move(board, move, player)
+            nodes += 1
+            score = -quiescence(child_board, next_player, depth - 1, -beta, -alpha, pieces - 1)
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+        return alpha
+
+    # Applies every move of a depth-1 node and scores the children from the mover's perspective in one batched call
+    def frontier_children(board, player, moves):
+        children = [apply_move(board, move, player) for move in moves]
+        # Child score is next_player * eval; negated for the mover that is player * eval
+        static_scores = evaluate_batch_fn([child_board for child_board, _ in children])
+        return children, [player * int(score) for score in static_scores]
+
+    # Score of a frontier child from the mover's perspective: its static score unless it is covered by the
+    # bitbases or has no legal move, tested in the order a depth-0 node tests them
+    def frontier_score(child_board, next_player, static_score, alpha, beta, child_pieces):
+        if bitbases is not None:
+            score = bitbase_score(child_board, next_player, -beta, -alpha, child_pieces, 0)
+            if score is not None:
+                return -score
+        if not has_legal_move(child_board, next_player):
+            return -terminal_score(child_board, next_player)
+        return static_score
+
+    # pieces is the number of pieces on the board, counted down along captures
+    def negamax(board, player, depth, alpha, beta, pieces):
+        nonlocal nodes
+        if bitbases is not None:
+            score = bitbase_score(board, player, alpha, beta, pieces, depth)
+            if score is not None:
+                return score
+        if depth == 0:
+            # A leaf only needs to know that one legal move exists
+            if not has_legal_move(board, player):
+                return terminal_score(board, player)
+            if quiescence_depth:
+                return quiescence(board, player, quiescence_depth, alpha, beta, pieces)
+            return player * evaluate_fn(board)
+
+        hash_move = None
+        if table is not None:
+            key = (position_key(board), player)
+            entry = table.get(key)
+            if entry is not None:
+                entry_depth, bound, entry_score, hash_move = entry
+                if entry_depth == depth:
+                    if bound == EXACT: return max(alpha, min(beta, entry_score))
+                    if bound == LOWER_BOUND and entry_score >= beta: return beta
+                    if bound == UPPER_BOUND and entry_score <= alpha: return alpha
+
+        legal_moves = generate_legal_moves(board, player)
+        if not legal_moves:
+            return terminal_score(board, player) # No moves = checkmate or stalemate
+        if order_all:
+            legal_moves = order_captures_first(board, legal_moves)
+            if hash_move in legal_moves:
+                legal_moves.remove(hash_move)
+                legal_moves.insert(0, hash_move)
+
+        best_move = None
+        if batched and depth == 1:
+            # Visit the children best static score first. A child keeps its static score unless it is terminal
+            # or covered, so in the usual cutoff case only one child pays those tests. Fail-hard alpha-beta
+            # returns the same score as the sequential loop below, whatever the order.
+            children, static_scores = frontier_children(board, player, legal_moves)
+            original_alpha = alpha
+            best_score = -float('inf')
+            for i in sorted(range(len(children)), key=static_scores.__getitem__, reverse=True):
+                nodes += 1
+                score = frontier_score(*children[i], static_scores[i], alpha, beta, pieces - is_capture_move(board, legal_moves[i]))
+                if alpha_beta:
+                    if score >= beta:
+                        if table is not None: table[key] = (depth, LOWER_BOUND, beta, legal_moves[i])
+                        return beta
+                    if score > alpha:
+                        alpha = score
+                        best_move = legal_moves[i]
+                elif score > best_score:
+                    best_score = score
+                    best_move = legal_moves[i]
+            if not alpha_beta:
+                if table is not None: table[key] = (depth, EXACT, best_score, best_move)
+                return best_score
+            if table is not None:
+                table[key] = (depth, EXACT if alpha > original_alpha else UPPER_BOUND, alpha, best_move)
+            return alpha
+
+        if alpha_beta:
+            original_alpha = alpha
+            for move in legal_moves:
+                child_board, next_player = apply_move(board, move, player)
+                nodes += 1
+                score = -negamax(child_board, next_player, depth - 1, -beta, -alpha, pieces - is_capture_move(board, move))
+                if score >= beta:
+                    if table is not None: table[key] = (depth, LOWER_BOUND, beta, move)
+                    return beta
+                if score > alpha:
+                    alpha = score
+                    best_move = move
+            if table is not None:
+                table[key] = (depth, EXACT if alpha > original_alpha else UPPER_BOUND, alpha, best_move)
+            return alpha
+
+        best_score = -float('inf')
+        for move in legal_moves:
+            child_board, next_player = apply_move(board, move, player)
+            nodes += 1
+            score = -negamax(child_board, next_player, depth - 1, -float('inf'), float('inf'), pieces - is_capture_move(board, move))
+            if score > best_score:
+                best_score = score
+                best_move = move
+        if table is not None: table[key] = (depth, EXACT, best_score, best_move)
+        return best_score
+
+    best_move = None
+    best_score = -float('inf')
+    alpha = -float('inf')
+    beta = float('inf')
+    moves = generate_legal_moves(board_state, player_to_move)
+    if config.move_ordering != ORDER_NONE:
+        moves = order_captures_first(board_state, moves)
+    pieces = sum(square != EMPTY for row in board_state for square in row)
+    # No position of the search can be covered when more pieces are left than captures can remove
+    if bitbases is not None and pieces - (depth + quiescence_depth) > PROBE_PIECES:
+        bitbases = None
+    if bitbases is not None:
+        root_result = probe(bitbases, board_state, player_to_move)
+        if root_result is not None:
+            # Already in a covered endgame: keep the moves that preserve its result and search the positions of
+            # the same table instead of probing them, so the search still finds the mate instead of stopping at
+            # known wins. A promotion (KPK into KQK) is still probed, so converting scores as a known win.
+            moves = [move for move in moves if -child_result(bitbases, board_state, move, player_to_move) == root_result] or moves
+            root_table = table_name(board_state)
+
+    # At depth 1 the root itself is a frontier node: score every child in one call
+    frontier = batched and depth == 1 and moves
+    if frontier:
+        children, static_scores = frontier_children(board_state, player_to_move, moves)
+
+    for i, move in enumerate(moves):
+        nodes += 1
+        if frontier:
+            score = frontier_score(*children[i], static_scores[i], alpha, beta, pieces - is_capture_move(board_state, move))
+        else:
+            child_board, next_player = apply_move(board_state, move, player_to_move)
+            score = -negamax(child_board, next_player, depth - 1, -beta, -alpha, pieces - is_capture_move(board_state, move))
+        if score > best_score:
+            best_score = score
+            best_move = move
+        if alpha_beta:
+            alpha = max(alpha, score)
+
+    return {"best_move": best_move, "score": best_score, "nodes": nodes}
+
+# Bitbase result of the position after a move, from the perspective of the player to move there
+def child_result(bitbases, board, move, player_to_move):
+    child_board, next_player = apply_move(board, move, player_to_move)
+    result = probe(bitbases, child_board, next_player)
+    return DRAW if result is None else result # The piece was captured: two bare kings
+
+# Score of a position without legal moves, from the perspective of the player to move
+def terminal_score(board, player_to_move):
+    if is_king_in_check(board, player_value_to_color_str(player_to_move)):
+        return -MATE_SCORE # Checkmate
+    return DRAW_SCORE # Stalemate
@@ -0,0 +1,236 @@
+# tournament.py
+# Parallel self-play tournament between engine configurations.
+# Complete games are played from dataset positions used as openings (each opening twice, with colours
+# swapped), many games at a time across all cores. Results are adjudicated locally by the rules of
+# chess, and the report relates playing strength to search speed: score, Elo difference with a 95%
+# error bar, nodes per second and CPU time per game.
+#
+# Usage:
+#   python3 src/tournament.py --engine fixed:depth=3 --engine selective:depth=3 --openings 20
+#   python3 src/tournament.py --engine fixed:movetime=0.2 --engine selective:movetime=0.2
+
+import argparse
+import csv
+import json
+import math
+import os
+from itertools import combinations
+from multiprocessing import Pool, cpu_count
+from time import process_time, time
+
+import chess
+
+from evaluation import evaluate_board
+from uci import MAX_DEPTH, SEARCH_FUNCTIONS, SearchLimits, search_with_limits
+from benchmark_positions import BENCHMARK_POSITIONS
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive', 'chessData.csv')
+DEFAULT_OPENINGS = 10
+DEFAULT_MAX_PLIES = 200 # Games still running after this many plies are adjudicated as draws
+DEFAULT_DEPTH = 3
+
+class EngineConfig:
+    """
+    One tournament participant, parsed from a spec such as "selective:depth=3" or "fixed:movetime=0.2,nodes=5000".
+    movetime is in seconds per move.
+    """
+    def __init__(self, spec):
+        engine, _, options = spec.partition(':')
+        if engine not in SEARCH_FUNCTIONS:
+            raise ValueError(f"Unknown engine '{engine}' in '{spec}', expected one of {sorted(SEARCH_FUNCTIONS)}")
+        self.name = spec
+        self.engine = engine
+        self.depth = None
+        self.movetime = None
+        self.nodes = None
+        for option in filter(None, options.split(',')):
+            key, _, value = option.partition('=')
+            if key == 'depth': self.depth = int(value)
+            elif key == 'movetime': self.movetime = float(value)
+            elif key == 'nodes': self.nodes = int(value)
+            else: raise ValueError(f"Unknown option '{key}' in '{spec}', expected depth, movetime or nodes")
+        if self.depth is None and self.movetime is None and self.nodes is None:
+            self.depth = DEFAULT_DEPTH
+
+    def limits(self):
+        return SearchLimits(depth=self.depth, movetime=self.movetime, nodes=self.nodes)
+
+    def max_depth(self):
+        # Time and node limited searches deepen until the limit stops them
+        return self.depth or MAX_DEPTH
+
+def load_openings(file_path, count):
+    """
+    Reads the first `count` playable positions (FEN column) from the dataset CSV.
+    Falls back to the bundled benchmark positions when the dataset is not available.
+    """
+    fens = []
+    if os.path.exists(file_path):
+        with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                if len(fens) >= count: break
+                if not chess.Board(row['FEN']).is_game_over():
+                    fens.append(row['FEN'])
+    else:
+        print(f"Dataset not found at {file_path}; using the bundled benchmark positions as openings.")
+        fens = [fen for category in BENCHMARK_POSITIONS.values() for fen in category
+                if not chess.Board(fen).is_game_over()][:count]
+    return fens
+
+def play_game(task):
+    """
+    Plays one game in a worker process.
+
+    Args:
+        task (tuple): (game_index, opening FEN, white EngineConfig, black EngineConfig, max plies).
+
+    Returns:
+        dict: The game result, with nodes, thinking time and CPU time per side.
+    """
+    game_index, fen, white, black, max_plies = task
+    board = chess.Board(fen)
+    sides = {chess.WHITE: white, chess.BLACK: black}
+    stats = {color: {"nodes": 0, "moves": 0, "think_time": 0.0, "cpu_time": 0.0} for color in sides}
+    cpu_start = process_time()
+    plies = 0
+
+    while plies < max_plies and board.outcome(claim_draw=True) is None:
+        config = sides[board.turn]
+        side_stats = stats[board.turn]
+        start_time, start_cpu = time(), process_time()
+        move, nodes = search_with_limits(SEARCH_FUNCTIONS[config.engine], board, config.limits(), evaluate_board, config.max_depth())
+        side_stats["think_time"] += time() - start_time
+        side_stats["cpu_time"] += process_time() - start_cpu
+        side_stats["nodes"] += nodes
+        side_stats["moves"] += 1
+        board.push(move)
+        plies += 1
+
+    outcome = board.outcome(claim_draw=True)
+    if outcome is None:
+        result, termination = "1/2-1/2", "max_plies"
+    else:
+        result, termination = outcome.result(), outcome.termination.name.lower()
+    return {
+        "game": game_index, "opening": fen, "white": white.name, "black": black.name,
+        "result": result, "termination": termination, "plies": plies,
+        "cpu_time": process_time() - cpu_start,
+        "white_stats": stats[chess.WHITE], "black_stats": stats[chess.BLACK]
+    }
+
+def elo_difference(wins, draws, losses):
+    """
+    Elo difference implied by a match score, with a 95% confidence interval from the per-game variance.
+
+    Returns:
+        tuple: (elo, error) where elo is None when every game has the same result (score 0% or 100%).
+    """
+    games = wins + draws + losses
+    if games == 0: return None, None
+    score = (wins + 0.5 * draws) / games
+    if score <= 0 or score >= 1: return None, None
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+
+    def to_elo(s):
+        s = min(max(s, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / s - 1)
+
+    return to_elo(score), (to_elo(score + margin) - to_elo(score - margin)) / 2
+
+def summarize(games, configs):
+    """
+    Aggregates finished games into per-pairing scores and per-engine speed statistics.
+    """
+    pairings = []
+    for a, b in combinations([c.name for c in configs], 2):
+        wins = draws = losses = 0
+        for g in games:
+            if {g["white"], g["black"]} != {a, b}: continue
+            if g["result"] == "1/2-1/2": draws += 1
+            elif (g["result"] == "1-0") == (g["white"] == a): wins += 1
+            else: losses += 1
+        n = wins + draws + losses
+        elo, error = elo_difference(wins, draws, losses)
+        pairings.append({"a": a, "b": b, "games": n, "wins": wins, "draws": draws, "losses": losses,
+                         "score": (wins + 0.5 * draws) / n if n else None, "elo": elo, "elo_error": error})
+
+    engines = []
+    for config in configs:
+        nodes = moves = 0
+        think_time = cpu_time = 0.0
+        played = 0
+        for g in games:
+            for color in ("white", "black"):
+                if g[color] == config.name:
+                    side = g[f"{color}_stats"]
+                    nodes += side["nodes"]; moves += side["moves"]
+                    think_time += side["think_time"]; cpu_time += side["cpu_time"]
+                    played += 1
+        engines.append({
+            "engine": config.name, "games": played, "moves": moves, "nodes": nodes,
+            "nps": nodes / think_time if think_time > 0 else 0.0,
+            "nodes_per_move": nodes / moves if moves else 0.0,
+            "cpu_time_per_game": cpu_time / played if played else 0.0,
+            "cpu_time_per_move": cpu_time / moves if moves else 0.0
+        })
+    return {"pairings": pairings, "engines": engines}
+
+def print_summary(summary):
+    print("\nResults")
+    for p in summary["pairings"]:
+        if not p["games"]: continue
+        elo = "n/a (one-sided result)" if p["elo"] is None else f"{p['elo'] + 0.0:+.0f} +/- {p['elo_error']:.0f}"
+        print(f"  {p['a']} vs {p['b']}: +{p['wins']} ={p['draws']} -{p['losses']} "
+              f"({p['score']:.1%} over {p['games']} games), Elo {elo}")
+    print("\nSpeed")
+    for e in summary["engines"]:
+        print(f"  {e['engine']:<28} nps {e['nps']:>9.0f}  nodes/move {e['nodes_per_move']:>9.0f}  "
+              f"CPU s/game {e['cpu_time_per_game']:>8.2f}  CPU s/move {e['cpu_time_per_move']:>7.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel self-play tournament between AlgoChess engine configurations.")
+    parser.add_argument('--engine', action='append', required=True, metavar='SPEC',
+                        help="Engine configuration, e.g. fixed:depth=3 or selective:movetime=0.2 (repeat for each participant).")
+    parser.add_argument('--openings', type=int, default=DEFAULT_OPENINGS, help="Number of dataset positions used as openings.")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="CSV file with a FEN column.")
+    parser.add_argument('--max-plies', type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument('--processes', type=int, default=cpu_count())
+    parser.add_argument('--output', help="Path of a JSON file receiving every game and the summary.")
+    args = parser.parse_args()
+
+    try:
+        configs = [EngineConfig(spec) for spec in args.engine]
+    except ValueError as e:
+        parser.error(str(e))
+    if len({c.name for c in configs}) != len(configs) or len(configs) < 2:
+        parser.error("at least two distinct --engine specs are required")
+
+    openings = load_openings(args.dataset, args.openings)
+    # Every pairing plays every opening once with each colour
+    tasks = []
+    for a, b in combinations(configs, 2):
+        for fen in openings:
+            tasks.append((len(tasks), fen, a, b, args.max_plies))
+            tasks.append((len(tasks), fen, b, a, args.max_plies))
+
+    print(f"Playing {len(tasks)} games from {len(openings)} openings using {args.processes} processes...")
+    start_time = time()
+    games = []
+    with Pool(processes=args.processes) as pool:
+        for game in pool.imap_unordered(play_game, tasks):
+            games.append(game)
+            print(f"  Game {len(games)}/{len(tasks)}: {game['white']} - {game['black']} {game['result']} "
+                  f"({game['termination']}, {game['plies']} plies)")
+    print(f"Tournament complete in {time() - start_time:.2f} seconds.")
+
+    games.sort(key=lambda g: g["game"])
+    summary = summarize(games, configs)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"games": games, "summary": summary}, f, indent=2)
+        print(f"\nGames and summary saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# uci.py
+# UCI protocol front-end for the AlgoChess engines, so they can be driven by standard tooling
+# (python-chess SimpleEngine, cutechess-cli, GUIs, match runners).
+#
+# Usage:
+#   python3 src/uci.py [--engine fixed|selective|naive]
+#
+# The game state is tracked with python-chess, so castling, en passant and promotions in
+# "position ... moves ..." are applied correctly. The engines themselves only see the 2D board.
+
+import argparse
+import sys
+import threading
+from time import time
+
+import chess
+
+from board import fen_to_2d_board
+from evaluation import evaluate_board
+from evaluation_cache import EvaluationCache
+from minimax import find_best_move_fixed_depth
+from search import KNOWN_WIN_SCORE, MATE_SCORE
+from selective import find_best_move_selective
+from minimax_naive import find_best_move_naive
+
+ENGINE_NAME = "AlgoChess"
+ENGINE_AUTHORS = "Mohamed Hussein, Zayne Bournand, Dajana Seitllari"
+SEARCH_FUNCTIONS = {
+    'fixed': find_best_move_fixed_depth,
+    'selective': find_best_move_selective,
+    'naive': find_best_move_naive,
+}
+DEFAULT_ENGINE = 'fixed'
+DEFAULT_DEPTH = 3
+MAX_DEPTH = 20
+DEFAULT_HASH_MB = 16
+MAX_HASH_MB = 1024
+BYTES_PER_CACHE_ENTRY = 250 # Approximate size of one EvaluationCache entry
+DEFAULT_MOVES_TO_GO = 30 # Moves assumed left in the game when only wtime/btime are given
+
+class SearchAborted(Exception):
+    """Raised from inside the evaluation function to unwind a search that must stop."""
+
+def square_name(pos):
+    row, col = pos
+    return 'abcdefgh'[col] + str(8 - row)
+
+def move_to_uci(board, move):
+    """
+    Converts an engine move ((row, col), (row, col)) into a python-chess Move on the given board.
+    The engines do not model promotion, so a pawn reaching the last rank is promoted to a queen.
+    """
+    from_pos, to_pos = move
+    uci_move = chess.Move.from_uci(square_name(from_pos) + square_name(to_pos))
+    if board.piece_type_at(uci_move.from_square) == chess.PAWN and chess.square_rank(uci_move.to_square) in (0, 7):
+        uci_move.promotion = chess.QUEEN
+    return uci_move
+
+def format_score(score, depth):
+    # Engine scores are from the side to move's perspective; mates carry no distance, so report the search horizon
+    if abs(score) >= MATE_SCORE:
+        moves = (depth + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    # A bitbase win (KNOWN_WIN_SCORE plus the evaluation) is a forced mate beyond the horizon: report it one move past it
+    if abs(score) >= KNOWN_WIN_SCORE // 2:
+        moves = (depth + 1) // 2 + 1
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {int(score)}"
+
+class SearchLimits:
+    """
+    Limits of one "go" command. A limit of None is not enforced.
+    """
+    def __init__(self, depth=None, movetime=None, nodes=None, infinite=False):
+        self.depth = depth
+        self.movetime = movetime # seconds
+        self.nodes = nodes
+        self.infinite = infinite
+
+class UciEngine:
+    """
+    Handles UCI commands. Searches run on a background thread so "stop" and "isready" are
+    answered while the engine is thinking.
+    """
+    def __init__(self, engine=DEFAULT_ENGINE, output=sys.stdout):
+        self.output = output
+        self.options = {'Engine': engine, 'Depth': DEFAULT_DEPTH, 'Hash': DEFAULT_HASH_MB}
+        self.board = chess.Board()
+        self.cache = None
+        self._resize_cache()
+        self._search_thread = None
+        self._search_limits = None
+        self._stop_event = threading.Event()
+        self._output_lock = threading.Lock()
+
+    def send(self, line):
+        with self._output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def _resize_cache(self):
+        max_entries = max(1, self.options['Hash'] * 1024 * 1024 // BYTES_PER_CACHE_ENTRY)
+        self.cache = EvaluationCache(evaluate_board, max_entries)
+
+    # --- Command handlers ---
+    def handle(self, line):
+        """
+        Handles one input line. Returns False when the engine should exit.
+        """
+        tokens = line.split()
+        if not tokens: return True
+        command, args = tokens[0], tokens[1:]
+        if command == 'uci':
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHORS}")
+            self.send(f"option name Engine type combo default {self.options['Engine']} " + " ".join(f"var {name}" for name in SEARCH_FUNCTIONS))
+            self.send(f"option name Depth type spin default {DEFAULT_DEPTH} min 1 max {MAX_DEPTH}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max {MAX_HASH_MB}")
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")
+        elif command == 'setoption':
+            self.set_option(args)
+        elif command == 'ucinewgame':
+            self.stop_search()
+            self.board = chess.Board()
+            self.cache.clear()
+        elif command == 'position':
+            self.stop_search()
+            self.set_position(args)
+        elif command == 'go':
+            self.stop_search()
+            self.start_search(self.parse_go(args))
+        elif command == 'stop':
+            self.stop_search()
+        elif command == 'quit':
+            self.stop_search()
+            return False
+        return True
+
+    def set_option(self, args):
+        # setoption name <name> [value <value>]
+        if 'name' not in args: return
+        name_end = args.index('value') if 'value' in args else len(args)
+        name = " ".join(args[args.index('name') + 1:name_end])
+        value = " ".join(args[name_end + 1:])
+        key = next((k for k in self.options if k.lower() == name.lower()), None)
+        if key == 'Engine' and value in SEARCH_FUNCTIONS:
+            self.options['Engine'] = value
+        elif key in ('Depth', 'Hash') and value.isdigit():
+            limit = MAX_DEPTH if key == 'Depth' else MAX_HASH_MB
+            self.options[key] = min(max(int(value), 1), limit)
+            if key == 'Hash': self._resize_cache()
+        else:
+            self.send(f"info string ignoring option {name} {value}".rstrip())
+
+    def set_position(self, args):
+        # position [startpos | fen <fen>] [moves <move1> ...]
+        # An invalid FEN keeps the previous position; an illegal move keeps the position before it.
+        moves_index = args.index('moves') if 'moves' in args else len(args)
+        if args and args[0] == 'fen':
+            fen = " ".join(args[1:moves_index])
+            try:
+                board = chess.Board(fen)
+            except ValueError:
+                self.send(f"info string invalid fen {fen}")
+                return
+        else:
+            board = chess.Board()
+        for uci_move in args[moves_index + 1:]:
+            try:
+                board.push_uci(uci_move)
+            except ValueError:
+                self.send(f"info string illegal move {uci_move} in {board.fen()}, ignoring it and the moves after it")
+                break
+        self.board = board
+
+    def parse_go(self, args):
+        values = {}
+        for i, token in enumerate(args[:-1]):
+            if args[i + 1].lstrip('-').isdigit():
+                values[token] = int(args[i + 1])
+        limits = SearchLimits(depth=values.get('depth'), nodes=values.get('nodes'), infinite='infinite' in args)
+        if 'movetime' in values:
+            limits.movetime = values['movetime'] / 1000
+        else:
+            # Simple time management: an equal share of the remaining clock, plus the increment
+            clock, increment = ('wtime', 'winc') if self.board.turn == chess.WHITE else ('btime', 'binc')
+            if clock in values:
+                moves_to_go = values.get('movestogo', DEFAULT_MOVES_TO_GO)
+                limits.movetime = max(values[clock] / max(moves_to_go, 1) + values.get(increment, 0) * 0.8, 10) / 1000
+        return limits
+
+    # --- Search ---
+    def start_search(self, limits):
+        self._stop_event.clear()
+        self._search_limits = limits
+        self._search_thread = threading.Thread(target=self.search, args=(self.board.copy(), limits), daemon=True)
+        self._search_thread.start()
+
+    def wait_search(self):
+        # Used at end of input: let a limited search finish, but stop an infinite one
+        if self._search_thread is not None and self._search_limits.infinite:
+            self._stop_event.set()
+        if self._search_thread is not None:
+            self._search_thread.join()
+            self._search_thread = None
+
+    def stop_search(self):
+        if self._search_thread is not None:
+            self._stop_event.set()
+            self._search_thread.join()
+            self._search_thread = None
+
+    def search(self, board, limits):
+        """
+        Runs the selected engine under the limits, reporting an info line for each completed depth.
+        """
+        cache = self.cache
+
+        def report(depth, result, move, nodes, elapsed):
+            nps = int(nodes / elapsed) if elapsed > 0 else 0
+            self.send(f"info depth {depth} score {format_score(result['score'], depth)} nodes {nodes} nps {nps} "
+                      f"time {int(elapsed * 1000)} hashfull {min(len(cache) * 1000 // cache.max_entries, 1000)} pv {move.uci()}")
+
+        best_move, _ = search_with_limits(SEARCH_FUNCTIONS[self.options['Engine']], board, limits, cache,
+                                          self.options['Depth'], self._stop_event, report)
+
+        # An infinite search may only report its move once it is stopped
+        if limits.infinite:
+            self._stop_event.wait()
+        self.send(f"bestmove {best_move.uci() if best_move else '0000'}")
+
+def search_with_limits(search_fn, board, limits, evaluate_fn, default_depth, stop_event=None, on_depth=None):
+    """
+    Iterative deepening with one of the engines on a python-chess board. The deepest completed
+    result is played when a limit or the stop event ends the search.
+
+    Args:
+        search_fn (function): One of the find_best_move_* functions.
+        board (chess.Board): The position to search.
+        limits (SearchLimits): Depth, time and node limits.
+        evaluate_fn (function): Evaluation function handed to the engine.
+        default_depth (int): Maximum depth when the limits set neither a depth nor a time, node or infinite
+            limit; those searches deepen up to MAX_DEPTH until their limit (or the stop event) ends them.
+        stop_event (threading.Event): Optional event that aborts the search when set.
+        on_depth (function): Optional callback(depth, result, move, nodes, elapsed) after each completed depth.
+
+    Returns:
+        tuple: (chess.Move or None, number of nodes searched). Nodes are the positions searched as
+        reported by the search core (as in benchmark.py), summed over the completed iterations.
+    """
+    if limits.depth:
+        max_depth = limits.depth
+    elif limits.movetime or limits.nodes or limits.infinite:
+        max_depth = MAX_DEPTH
+    else:
+        max_depth = default_depth
+    board_state = fen_to_2d_board(board.fen())
+    player_to_move = 1 if board.turn == chess.WHITE else -1
+    start_time = time()
+    deadline = start_time + limits.movetime if limits.movetime else None
+    nodes = 0 # Positions searched by the completed iterations
+    evaluations = 0 # Evaluations made by the running iteration
+
+    # The limits are checked where the engines evaluate, so they can be stopped without modifying them.
+    # Every evaluation belongs to a searched position, so the evaluations made so far are a lower bound
+    # of the running iteration's nodes.
+    def evaluate_with_limits(board_to_evaluate):
+        nonlocal evaluations
+        evaluations += 1
+        if (stop_event is not None and stop_event.is_set()) or (limits.nodes and nodes + evaluations > limits.nodes) \
+                or (deadline and (evaluations & 63) == 0 and time() > deadline):
+            raise SearchAborted()
+        return evaluate_fn(board_to_evaluate)
+
+    best_move = None
+    for depth in range(1, max_depth + 1):
+        evaluations = 0
+        try:
+            result = search_fn(board_state, player_to_move, depth, evaluate_with_limits)
+        except SearchAborted:
+            break
+        nodes += result["nodes"]
+        if result["best_move"] is None: break
+        best_move = move_to_uci(board, result["best_move"])
+        if on_depth: on_depth(depth, result, best_move, nodes, time() - start_time)
+        if (deadline and time() > deadline) or (limits.nodes and nodes >= limits.nodes): break
+
+    if best_move is None or best_move not in board.legal_moves:
+        # Nothing completed (or a move outside the engines' rules): fall back to any legal move
+        best_move = next(iter(board.legal_moves), None)
+    return best_move, nodes
+
+def main():
+    parser = argparse.ArgumentParser(description="UCI front-end for the AlgoChess engines.")
+    parser.add_argument('--engine', choices=sorted(SEARCH_FUNCTIONS), default=DEFAULT_ENGINE)
+    args = parser.parse_args()
+    engine = UciEngine(args.engine)
+    for line in sys.stdin:
+        if not engine.handle(line.strip()):
+            break
+    else:
+        engine.wait_search()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# test_bitbase.py
+# Regression tests for probing the endgame bitbases (src/bitbase.py).
+#
+# Usage:
+#   python3 -m pytest tests
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bitbase import DRAW, LOSS, TABLE_SIZE, WIN, default_bitbases, position_index, probe
+from benchmark import parse_position
+from evaluation import evaluate_board
+from minimax import find_best_move_fixed_depth
+from search import KNOWN_WIN_SCORE
+
+# White pawn on a7 with the kings on c1 and h1: a7-a8 promotes and wins
+PROMOTION_FEN = "8/P7/8/8/8/8/8/2K4k w - - 0 1"
+# (FEN, promoting move) for both colours. In the black position the king moves are generated before
+# the promotion, so playing it shows that converting scores above the other winning moves.
+PROMOTIONS = [
+    (PROMOTION_FEN, ((1, 0), (0, 0))),
+    ("2k4K/8/8/8/8/8/p7/8 b - - 0 1", ((6, 0), (7, 0))),
+]
+
+def _tables(won_indices):
+    # KQK with only the given positions won, and a KPK where nothing is won
+    won = np.zeros(TABLE_SIZE, dtype=bool)
+    won[won_indices] = True
+    return {'KQK': np.packbits(won), 'KPK': np.packbits(np.zeros(TABLE_SIZE, dtype=bool))}
+
+def test_promoted_white_pawn_is_probed_as_a_queen():
+    # a8 = 0, c1 = 58, h1 = 63, black (the lone king) to move
+    bitbases = _tables([position_index(1, 58, 63, 0)])
+    board, _ = parse_position("P7/8/8/8/8/8/8/2K4k b - - 0 1")
+    assert probe(bitbases, board, -1) == LOSS
+
+def test_promoted_black_pawn_is_probed_as_a_queen():
+    # Mirrored: the black pawn on a1 becomes a white queen on a8, the black king on c8 the white king on c1
+    bitbases = _tables([position_index(1, 58, 63, 0)])
+    board, _ = parse_position("2k4K/8/8/8/8/8/8/p7 w - - 0 1")
+    assert probe(bitbases, board, 1) == LOSS
+
+def test_unpromoted_pawn_is_probed_in_kpk():
+    bitbases = _tables([position_index(0, 58, 63, 8)])
+    board, player_to_move = parse_position(PROMOTION_FEN)
+    assert probe(bitbases, board, player_to_move) == DRAW
+
+@pytest.mark.skipif(not {'KQK', 'KPK'} <= set(default_bitbases()), reason="run python3 src/bitbase.py to generate the tables")
+@pytest.mark.parametrize("fen, promotion", PROMOTIONS)
+@pytest.mark.parametrize("depth", [1, 2, 3, 4])
+def test_fixed_engine_promotes_in_covered_kpk(fen, promotion, depth):
+    board, player_to_move = parse_position(fen)
+    assert probe(default_bitbases(), board, player_to_move) == WIN
+    result = find_best_move_fixed_depth(board, player_to_move, depth, evaluate_board)
+    assert result["best_move"] == promotion
+    assert result["score"] >= KNOWN_WIN_SCORE
@@ -0,0 +1,71 @@
+# test_pipeline.py
+# Runs the streaming pipeline (src/pipeline.py) the way main.py does with --profile, against a
+# stand-in for Stockfish, with more than one search process.
+
+import os
+import stat
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from benchmark import parse_position
+from benchmark_positions import BENCHMARK_POSITIONS
+from evaluation import evaluate_board
+from main import get_engine_moves, get_naive_move, PROFILE_PHASE_SEARCH, PROFILE_PHASE_JUDGE, PROFILE_PHASE_NAIVE
+from pipeline import run_pipeline
+from profiling import ProfileSession
+
+# A minimal UCI engine that answers every search at once with a fixed score and its first legal move
+FAKE_STOCKFISH = '''#!{python}
+import sys
+import chess
+
+board = chess.Board()
+for line in sys.stdin:
+    tokens = line.split()
+    if not tokens: continue
+    if tokens[0] == 'uci': print("id name FakeStockfish"); print("uciok")
+    elif tokens[0] == 'isready': print("readyok")
+    elif tokens[0] == 'position' and tokens[1] == 'fen': board = chess.Board(" ".join(tokens[2:8]))
+    elif tokens[0] == 'go':
+        move = next(iter(board.legal_moves), None)
+        print("info depth 1 score cp 12" + (" pv " + move.uci() if move else ""))
+        print("bestmove " + (move.uci() if move else "(none)"))
+    elif tokens[0] == 'quit': break
+    sys.stdout.flush()
+'''
+
+@pytest.fixture
+def fake_stockfish(tmp_path):
+    path = tmp_path / "stockfish"
+    path.write_text(FAKE_STOCKFISH.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+def _boards():
+    boards = []
+    for board_id, fen in enumerate(BENCHMARK_POSITIONS["opening"] + BENCHMARK_POSITIONS["endgame"]):
+        board_state, player_to_move = parse_position(fen)
+        boards.append({"board_id": board_id, "board_state": board_state, "player_to_move": player_to_move})
+    return boards
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_pipeline_with_profiling_and_several_processes(tmp_path, fake_stockfish, mode):
+    profiler = ProfileSession(mode, str(tmp_path / "profiles"), interval=0.001)
+    boards = _boards()
+    results, _ = run_pipeline(
+        boards, boards, profiler.wrap(get_engine_moves, PROFILE_PHASE_SEARCH), (1, 1, evaluate_board),
+        boards, profiler.wrap(get_naive_move, PROFILE_PHASE_NAIVE), (1, evaluate_board),
+        processes=2, judges=1, engine_path=fake_stockfish,
+        profile_judge=lambda judging: profiler.profile_coroutine(PROFILE_PHASE_JUDGE, judging))
+
+    for r in results:
+        for engine in ("fixed", "selective", "naive"):
+            # The stand-in scores every position +12 for the side to move; results are from white's view
+            assert abs(r[f"{engine}_true_score"]) == 12
+    merged = profiler.merge_all()
+    if mode == "cprofile":
+        # Sampling may miss the short searches, but cProfile records every phase
+        assert len(merged) == 3 and all(merged)
@@ -0,0 +1,36 @@
+# test_results_log.py
+# Regression tests for resuming from the JSONL results log (src/results_log.py).
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from results_log import RECORD_SEARCH, SEARCH_FIELDS, ResultsLog
+
+def _board(board_id):
+    return {"board_id": board_id, "player_to_move": 1, "fixed_best_move": ((6, 4), (4, 4)), "fixed_score": 25}
+
+def test_record_after_a_torn_line_survives_resume(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    log = ResultsLog(path)
+    log.write_config({"num_boards": 3})
+    log.record(RECORD_SEARCH, _board(1), SEARCH_FIELDS)
+    # Crash in the middle of writing the record of board 2
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"record": "search", "board_id": 2, "fixed_sc')
+
+    resumed = ResultsLog(path, resume=True)
+    assert resumed.is_done(RECORD_SEARCH, 1) and not resumed.is_done(RECORD_SEARCH, 2)
+    resumed.record(RECORD_SEARCH, _board(3), SEARCH_FIELDS)
+
+    reloaded = ResultsLog(path, resume=True)
+    assert reloaded.is_done(RECORD_SEARCH, 1)
+    assert reloaded.is_done(RECORD_SEARCH, 3)
+    assert reloaded.boards[3]["fixed_best_move"] == ((6, 4), (4, 4))
+
+def test_infinite_score_is_stored_as_null(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    log = ResultsLog(path)
+    log.record(RECORD_SEARCH, dict(_board(1), fixed_score=-float('inf')), SEARCH_FIELDS)
+    assert ResultsLog(path, resume=True).boards[1]["fixed_score"] is None
@@ -0,0 +1,34 @@
+# test_uci.py
+# Regression tests for the UCI front-end (src/uci.py).
+
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import chess
+
+from search import KNOWN_WIN_SCORE, MATE_SCORE
+from uci import UciEngine, format_score
+
+def test_illegal_move_is_rejected_and_the_engine_keeps_running():
+    output = io.StringIO()
+    engine = UciEngine(output=output)
+    assert engine.handle("position startpos moves e2e4 e7e5 e1e3 g1f3")
+    assert "info string illegal move e1e3" in output.getvalue()
+    # The position stops before the illegal move
+    assert engine.board.fen() == "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+    assert engine.handle("isready")
+    assert output.getvalue().endswith("readyok\n")
+
+def test_invalid_fen_keeps_the_previous_position():
+    engine = UciEngine(output=io.StringIO())
+    engine.handle("position fen not-a-fen")
+    assert engine.board == chess.Board()
+
+def test_known_wins_are_reported_as_mate():
+    assert format_score(MATE_SCORE, 3) == "mate 2"
+    assert format_score(KNOWN_WIN_SCORE + 250, 3) == "mate 3"
+    assert format_score(-KNOWN_WIN_SCORE - 250, 3) == "mate -3"
+    assert format_score(250, 3) == "cp 250"